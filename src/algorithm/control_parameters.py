@@ -0,0 +1,118 @@
+import numpy as np
+rng = np.random.default_rng()
+
+
+class ControlParameters:
+    """Fixed control parameters (perturbation factor F and crossover probability CR) of the differential evolution. The
+    parameters of each individual are stored in arrays of shape (individuals, 2) next to its heat loads. Adaptive variants
+    draw from the given random generator (the one of their DE run)"""
+
+    def __init__(self, perturbation_factor, probability_crossover, generator=None):
+        self.perturbation_factor = perturbation_factor
+        self.probability_crossover = probability_crossover
+        self.generator = rng if generator is None else generator
+
+    def initialize(self, parameters):
+        """Control parameters of the initial population at the start of a differential evolution run"""
+        parameters[:, 0] = self.perturbation_factor
+        parameters[:, 1] = self.probability_crossover
+
+    def generate(self, parents, trials):
+        """Control parameters used to create the trials from their parents"""
+        trials[:] = parents
+
+    def update(self, trials, successful, improvements):
+        """Adaptation after the selection: successful trials were not dominated by their parents, improvements are the
+        summed objective gains of the trials over their parents"""
+        pass
+
+    def state(self):
+        """Adaptation state, which is stored in the final state of a run"""
+        return None
+
+    def restore(self, state):
+        """Restore the adaptation state of an earlier run, whose population is resumed"""
+        pass
+
+
+class JDEControlParameters(ControlParameters):
+    """Self-adaptive control parameters of jDE (Brest et al., 2006): each trial inherits F and CR from its parent or
+    draws new ones, which survive with the trial"""
+
+    def __init__(self, perturbation_factor, probability_crossover, generator=None, probability_new_perturbation_factor=0.1, probability_new_crossover=0.1):
+        super().__init__(perturbation_factor, probability_crossover, generator)
+        self.probability_new_perturbation_factor = probability_new_perturbation_factor
+        self.probability_new_crossover = probability_new_crossover
+
+    def generate(self, parents, trials):
+        trials[:] = parents
+        number_individuals = len(trials)
+        new_perturbation_factors = self.generator.random(number_individuals) < self.probability_new_perturbation_factor
+        trials[new_perturbation_factors, 0] = 0.1 + 0.9 * self.generator.random(np.count_nonzero(new_perturbation_factors))
+        new_crossover = self.generator.random(number_individuals) < self.probability_new_crossover
+        trials[new_crossover, 1] = self.generator.random(np.count_nonzero(new_crossover))
+
+
+class SHADEControlParameters(ControlParameters):
+    """Success-history based adaptation of the control parameters (SHADE, Tanabe and Fukunaga, 2013): F and CR of each
+    trial are sampled around a randomly chosen entry of a memory of successful means"""
+
+    def __init__(self, perturbation_factor, probability_crossover, generator=None, memory_size=5):
+        super().__init__(perturbation_factor, probability_crossover, generator)
+        self.memory_size = memory_size
+        self.memory = np.zeros([memory_size, 2])
+        self.memory_index = 0
+
+    def initialize(self, parameters):
+        super().initialize(parameters)
+        self.memory[:, 0] = self.perturbation_factor
+        self.memory[:, 1] = self.probability_crossover
+        self.memory_index = 0
+
+    def generate(self, parents, trials):
+        number_individuals = len(trials)
+        memory = self.memory[self.generator.integers(0, self.memory_size, number_individuals)]
+        trials[:, 1] = np.clip(self.generator.normal(memory[:, 1], 0.1), 0.0, 1.0)
+        perturbation_factors = memory[:, 0] + 0.1 * self.generator.standard_cauchy(number_individuals)
+        resample = perturbation_factors <= 0
+        while np.any(resample):
+            perturbation_factors[resample] = memory[resample, 0] + 0.1 * self.generator.standard_cauchy(np.count_nonzero(resample))
+            resample = perturbation_factors <= 0
+        trials[:, 0] = np.minimum(perturbation_factors, 1.0)
+
+    def update(self, trials, successful, improvements):
+        if not np.any(successful):
+            return
+        # Only gains count as success, a trial that merely was not dominated must not pull the memory
+        weights = np.maximum(improvements[successful], 0.0)
+        if np.sum(weights) == 0:
+            weights = np.ones(len(weights))
+        weights /= np.sum(weights)
+        perturbation_factors = trials[successful, 0]
+        crossover_probabilities = trials[successful, 1]
+        # Weighted Lehmer mean for F, weighted arithmetic mean for CR
+        self.memory[self.memory_index, 0] = np.sum(weights * perturbation_factors**2) / np.sum(weights * perturbation_factors)
+        self.memory[self.memory_index, 1] = np.sum(weights * crossover_probabilities)
+        self.memory_index = (self.memory_index + 1) % self.memory_size
+
+    def state(self):
+        return self.memory.copy(), self.memory_index
+
+    def restore(self, state):
+        memory, self.memory_index = state
+        self.memory = memory.copy()
+
+
+def create_control_parameters(algorithm_parameter, generator=None):
+    """Control parameters of the DE variant selected in the algorithm parameters"""
+    variant = algorithm_parameter.differential_evolution_variant
+    perturbation_factor = algorithm_parameter.differential_evolution_perturbation_factor
+    probability_crossover = algorithm_parameter.differential_evolution_probability_crossover
+    if variant == 'classic':
+        return ControlParameters(perturbation_factor, probability_crossover, generator)
+    elif variant == 'jDE':
+        return JDEControlParameters(perturbation_factor, probability_crossover, generator)
+    elif variant == 'SHADE':
+        return SHADEControlParameters(perturbation_factor, probability_crossover, generator)
+    else:
+        raise ValueError('DE variant "{0}" is invalid, choose classic, jDE or SHADE.'.format(variant))
@@ -1,24 +1,61 @@
-from deap import tools
+from collections import deque
 from deap import creator
-from deap import base
-import gc
 import numpy as np
 rng = np.random.default_rng()
 np.warnings.filterwarnings('ignore', category=np.VisibleDeprecationWarning)
 
+from algorithm.control_parameters import create_control_parameters
+from algorithm.energy_balance import EnergyBalance
+from algorithm.heat_load_bounds import HeatLoadBounds
+from algorithm.inner_optimizer import InnerOptimizer
+from algorithm.lru_cache import LRUCache
+from algorithm.pareto import hypervolume_2d, pareto_front, select_nsga2
 from heat_exchanger_network.economics import Economics
 from heat_exchanger_network.restrictions import Restrictions
 from heat_exchanger_network.heat_exchanger_network import HeatExchangerNetwork
 
-class DifferentialEvolution():
+# Evaluation memos (MemoDE) of this process by case study and objectives, shared by all copies of the DE sent to it
+evaluation_memos = dict()
+
+
+def process_evaluation_memo(memo_key, maxsize):
+    """Evaluation memo of this process, which outlives the copies of the DE sent to a worker with each task chunk"""
+    if memo_key not in evaluation_memos or evaluation_memos[memo_key].maxsize != maxsize:
+        evaluation_memos[memo_key] = LRUCache(maxsize)
+    return evaluation_memos[memo_key]
+
+class DifferentialEvolutionRun:
+    """State of the differential evolution of one topology within a batch of topologies; all random numbers of the run
+    are drawn from its own generator, so that a topology evolves the same with or without other topologies in its batch"""
+
+    def __init__(self, exchanger_addresses, bounds, energy_balance, control_parameters, hypervolume_window, generator=None):
+        self.exchanger_addresses = exchanger_addresses
+        self.generator = rng if generator is None else generator
+        self.bounds = bounds
+        self.energy_balance = energy_balance
+        self.control_parameters = control_parameters
+        self.number_individuals = 0
+        self.number_generations = 0
+        self.generation = 0
+        self.number_without_improvement = 0
+        self.hypervolumes = deque(maxlen=hypervolume_window + 1)
+        self.reference_point = None
+        self.is_finished = False
+        self.final_state = None
+        self.result = None
+
+
+class DifferentialEvolution(InnerOptimizer):
     """Differential evolution (DE) algorithm for optimization of heat duties for from genetic algorithm predefined
     HEX matches"""
 
     def __init__(self, case_study, algorithm_parameter):
+        super().__init__()
         self.case_study = case_study
         self.restrictions = Restrictions(case_study)
         self.economics = Economics(case_study)
         self.heat_exchanger_network = HeatExchangerNetwork(self.case_study)
+        self.evaluation_network = HeatExchangerNetwork(self.case_study)
         self.absolute_heat_load_tolerance = self.restrictions.absolute_heat_load_tolerance
         self.number_heat_exchangers = case_study.number_heat_exchangers
         self.range_heat_exchangers = case_study.range_heat_exchangers
@@ -29,35 +66,122 @@ class DifferentialEvolution():
         self.hot_streams = case_study.hot_streams
         self.cold_streams = case_study.cold_streams
         self.min_heat_load = case_study.manual_parameter['MinimalHeatLoad'].iloc[0]
+        if algorithm_parameter.differential_evolution_variant not in ['classic', 'jDE', 'SHADE']:
+            raise ValueError('DE variant "{0}" is invalid, choose classic, jDE or SHADE.'.format(algorithm_parameter.differential_evolution_variant))
+        if algorithm_parameter.differential_evolution_initialization not in ['random', 'sobol', 'lhs']:
+            raise ValueError('Initialization design "{0}" is invalid, choose random, sobol or lhs.'.format(algorithm_parameter.differential_evolution_initialization))
         self.population_size = algorithm_parameter.differential_evolution_population_size
         self.pareto_size = algorithm_parameter.differential_evolution_pareto_size
         self.number_generations = algorithm_parameter.differential_evolution_number_generations
         self.number_no_improvement = algorithm_parameter.differential_evolution_number_no_improvement
         self.probability_crossover = algorithm_parameter.differential_evolution_probability_crossover
         self.perturbation_factor = algorithm_parameter.differential_evolution_perturbation_factor
+        self.tighten_bounds = algorithm_parameter.differential_evolution_tighten_bounds
+        self.repair_energy_balance = algorithm_parameter.differential_evolution_repair_energy_balance
+        self.hypervolume_tolerance = algorithm_parameter.differential_evolution_hypervolume_tolerance
+        self.hypervolume_window = algorithm_parameter.differential_evolution_hypervolume_window
+        self.initialization_design = algorithm_parameter.differential_evolution_initialization
+        self.resume_generations = algorithm_parameter.differential_evolution_resume_generations
+        self.snap_heat_loads = algorithm_parameter.differential_evolution_snap_heat_loads
+        self.memo_key = (case_study.name, tuple(algorithm_parameter.objective_types))
+        self.evaluation_memo = process_evaluation_memo(self.memo_key, algorithm_parameter.differential_evolution_memo_size)
+        self.algorithm_parameter = algorithm_parameter
         self.objective_types = algorithm_parameter.objective_types
+        self.number_memo_hits = 0
+        self.record_history = False
+        self.history = list()
         self.pareto_front_de = None
         self.best_solution = None
+        self.number_topologies = 0
+        self.allocate_buffers(1)
+
+    def __getstate__(self):
+        """The evaluation memo stays in its process, the copy of a worker uses the memo of the worker process"""
+        state = self.__dict__.copy()
+        del state['evaluation_memo']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.evaluation_memo = process_evaluation_memo(self.memo_key, self.algorithm_parameter.differential_evolution_memo_size)
+
+    def allocate_buffers(self, number_topologies):
+        """Preallocated buffers of shape (pools, halves, topologies, individuals, ...): two pools, swapped each generation,
+        each with a half of parents and a half of trials; buffers are only reallocated for larger batches of topologies"""
+        if number_topologies <= self.number_topologies:
+            return
+        self.number_topologies = number_topologies
+        shape = [2, 2, number_topologies, self.population_size]
+        self.heat_loads_pools = np.zeros(shape + [self.number_heat_exchangers, self.number_operating_cases])
+        self.objectives_pools = np.zeros(shape + [len(self.objective_types)])
+        self.feasibility_pools = np.zeros(shape, dtype=bool)
+        self.control_parameter_pools = np.zeros(shape + [2])
+        self.scratch_heat_loads = np.zeros([number_topologies, self.population_size, self.number_heat_exchangers, self.number_operating_cases])
+        self.scratch_mask = np.zeros([number_topologies, self.population_size, self.number_heat_exchangers, self.number_operating_cases], dtype=bool)
 
     def initialize_individual(self, individual_class, exchanger_addresses):
         """Create an individual matrix of heat duties for all existing HEX matches"""
+        bounds = HeatLoadBounds(self.case_study, exchanger_addresses, self.min_heat_load)
         heat_duties = np.zeros([self.number_heat_exchangers, self.number_operating_cases])
-        for exchanger in self.range_heat_exchangers:
-            if exchanger_addresses[exchanger, 7] == 1:
-                for operating_case in self.range_operating_cases:
-                    max_heat_duty = np.nanmin((self.hot_streams[exchanger_addresses[exchanger, 0]].enthalpy_flows[operating_case], self.cold_streams[exchanger_addresses[exchanger, 1]].enthalpy_flows[operating_case]))
-                    if max_heat_duty != 0:
-                        heat_duties[exchanger, operating_case] = (max_heat_duty - self.min_heat_load) * rng.random() + self.min_heat_load
-                    else:
-                        heat_duties[exchanger, operating_case] = max_heat_duty
+        bounds.sample(heat_duties)
         individual = individual_class([heat_duties.tolist(), self.heat_exchanger_network])
         return individual
-    
-    def fitness_function(self, exchanger_addresses, individual):
-        """Calculate the whole network including costs"""
-        heat_exchanger_network = HeatExchangerNetwork(self.case_study)
-        heat_exchanger_network.exchanger_addresses.matrix = exchanger_addresses
-        heat_exchanger_network.thermodynamic_parameter.heat_loads = np.array(individual[0])
+
+    @staticmethod
+    def seed_population(heat_loads, initial_heat_loads, bounds):
+        """Overwrite the first individuals of a sampled population with the given heat loads (NaN entries keep their
+        sampled value) clipped to the bounds"""
+        number_seeds = min(len(initial_heat_loads), len(heat_loads))
+        seeds = np.clip(initial_heat_loads[:number_seeds], bounds.lower, bounds.upper)
+        np.copyto(heat_loads[:number_seeds], seeds, where=~np.isnan(seeds))
+        heat_loads[:number_seeds, bounds.fixed_zero] = 0.0
+
+    def mutate_heat_loads(self, parents, trials, number_individuals, bounds, control_parameters, generators=None):
+        """Mutation and crossover of the parents of several topologies (topologies, individuals, exchangers, operating
+        cases), of which the first number_individuals of each topology are valid, into the preallocated trial buffer with
+        the control parameters (F, CR) of each trial and the (stacked) bounds of the topologies; the random numbers of each
+        topology are drawn from its generator"""
+        number_topologies, population_size = parents.shape[:2]
+        scratch = self.scratch_heat_loads[:number_topologies]
+        mask = self.scratch_mask[:number_topologies]
+        flat_parents = parents.reshape((number_topologies * population_size,) + parents.shape[2:])
+        flat_trials = trials.reshape(flat_parents.shape)
+        flat_scratch = scratch.reshape(flat_parents.shape)
+        if generators is None:
+            generators = [rng] * number_topologies
+        # Donors of each trial are drawn from the valid parents of its topology
+        donors = np.stack([generator.random((3, population_size)) for generator in generators], axis=1)
+        donors = (donors * number_individuals[:, np.newaxis]).astype(int)
+        donors += (np.arange(number_topologies) * population_size)[:, np.newaxis]
+        # Mutation
+        np.take(flat_parents, donors[1].ravel(), axis=0, out=flat_trials)
+        np.take(flat_parents, donors[2].ravel(), axis=0, out=flat_scratch)
+        trials -= scratch
+        trials *= control_parameters[..., 0, np.newaxis, np.newaxis]
+        np.take(flat_parents, donors[0].ravel(), axis=0, out=flat_scratch)
+        trials += scratch
+        np.absolute(trials, out=trials)
+        # Repair of heat duties out of bounds
+        for topology, generator in enumerate(generators):
+            generator.random(out=scratch[topology])
+        scratch *= bounds.span
+        scratch += bounds.lower
+        np.copyto(trials, scratch, where=bounds.violated(trials, out=mask))
+        np.copyto(trials, 0.0, where=bounds.fixed_zero)
+        # Recombination / crossover
+        for topology, generator in enumerate(generators):
+            generator.random(out=scratch[topology])
+        np.greater_equal(scratch, control_parameters[..., 1, np.newaxis, np.newaxis], out=mask)
+        forced = np.concatenate([generator.integers(0, self.number_heat_exchangers * self.number_operating_cases, size=population_size) for generator in generators])
+        mask.reshape(number_topologies * population_size, -1)[np.arange(number_topologies * population_size), forced] = False
+        np.copyto(trials, parents, where=mask)
+
+    def update_network(self, heat_exchanger_network, exchanger_addresses, heat_loads):
+        """Set topology and heat loads of a network and derive the mixer alleles (on a copy of the exchanger addresses, so
+        that every evaluation of a topology starts from the same mixer alleles)"""
+        heat_exchanger_network.exchanger_addresses.matrix = np.array(exchanger_addresses)
+        heat_exchanger_network.thermodynamic_parameter.heat_loads = heat_loads
+        heat_exchanger_network.clear_cache()
         for exchanger in self.range_heat_exchangers:
             if 'bypass_hot' in  heat_exchanger_network.heat_exchangers[exchanger].operation_parameter.mixer_types:
                 heat_exchanger_network.exchanger_addresses.matrix[exchanger, 3] = 1
@@ -75,10 +199,13 @@ class DifferentialEvolution():
                 heat_exchanger_network.exchanger_addresses.matrix[exchanger, 6] = 1
             else:
                 heat_exchanger_network.exchanger_addresses.matrix[exchanger, 6] = 0
-
         heat_exchanger_network.clear_cache()
+
+    def network_objectives(self, heat_exchanger_network):
+        """Calculate the objectives (or the infeasibility penalty) and the feasibility of a network"""
         objectives = np.zeros(len(self.objective_types))
-        if heat_exchanger_network.is_feasible:
+        is_feasible = heat_exchanger_network.is_feasible
+        if is_feasible:
             for of in range(len(self.objective_types)):
                 if self.objective_types[of] == 'TAC':
                     objectives[of] = self.economics.initial_operating_costs / heat_exchanger_network.total_annual_cost
@@ -90,73 +217,229 @@ class DifferentialEvolution():
                     objectives[of] = self.economics.initial_operating_emissions / heat_exchanger_network.operating_emissions
 
         else:
-            quadratic_distance = sum([heat_exchanger_network.heat_exchangers[exchanger].infeasibility_temperature_differences[1] + heat_exchanger_network.heat_exchangers[exchanger].infeasibility_mixer[1] for exchanger in self.range_heat_exchangers] + heat_exchanger_network.infeasibility_energy_balance[1])
+            # The energy balance distance of the network is weighted with the number of HEX
+            quadratic_distance = sum([heat_exchanger_network.heat_exchangers[exchanger].infeasibility_temperature_differences[1] + heat_exchanger_network.heat_exchangers[exchanger].infeasibility_mixer[1] for exchanger in self.range_heat_exchangers]) + \
+                self.number_heat_exchangers * heat_exchanger_network.infeasibility_energy_balance[1]
             objectives[0] = 1 / (4 + quadratic_distance)
             objectives[1] = 1 / (4 + quadratic_distance)
-        return objectives[0], objectives[1], heat_exchanger_network
-
-    def differential_evolution(self, exchanger_addresses):
-        """Main differential evolution algorithm"""
-        exchanger_addresses = np.array(exchanger_addresses)
-        toolbox = base.Toolbox()
-        toolbox.register('individual_de', self.initialize_individual, creator.Individual_de, exchanger_addresses)
-        toolbox.register('population_de', tools.initRepeat, list, toolbox.individual_de)
-        toolbox.register('select_parents_de', tools.selRandom, k=3)
-        toolbox.register('select_de', tools.selNSGA2, k=2*self.pareto_size, nd='log')
-        toolbox.register('evaluate_de', self.fitness_function, exchanger_addresses)
-
-        # Initialize population
-        population = toolbox.population_de(n=self.population_size)
-        # Evaluate entire population
-        fitness = list(toolbox.map(toolbox.evaluate_de, population))
-        for individual, fit in zip(population, fitness):
-            individual.fitness.values = fit[0:2]
-            individual[1] = fit[2]
-
-        number_generations_de = 0
-        number_without_improvement_de = 0
-        while number_generations_de <= self.number_generations and number_without_improvement_de <= self.number_no_improvement:
-            # print('--DE: Generation %i --' % number_generations_de)
-            number_generations_de += 1
-            population_temporary = list()
-            for pop, agent in enumerate(population):
-                individual_r1, individual_r2, individual_r3 = np.array(toolbox.select_parents_de(population))
-                individual_donor = toolbox.clone(agent)
-                index = rng.choice(len(individual_r1[0]))
-                for exchanger in self.range_heat_exchangers:
-                    for operating_case in self.range_operating_cases:
-                        # recombination / Crossover
-                        if pop == index or rng.random() < self.probability_crossover:
-                            # Mutation
-                            if exchanger_addresses[exchanger, 7]:
-                                individual_donor[0][exchanger][operating_case] = np.absolute(individual_r1[0][exchanger][operating_case] + self.perturbation_factor * (individual_r2[0][exchanger][operating_case] - individual_r3[0][exchanger][operating_case]))
-                                max_heat_duty = np.nanmin((self.hot_streams[exchanger_addresses[exchanger, 0]].enthalpy_flows[operating_case], self.cold_streams[exchanger_addresses[exchanger, 1]].enthalpy_flows[operating_case]))
-                                if max_heat_duty != 0 and (individual_donor[0][exchanger][operating_case] < self.min_heat_load or individual_donor[0][exchanger][operating_case] > max_heat_duty):
-                                    individual_donor[0][exchanger][operating_case] = (max_heat_duty - self.min_heat_load) * rng.random() + self.min_heat_load
-                            else:
-                                individual_donor[0][exchanger][operating_case] = 0.0
-                evaluated_donor = toolbox.evaluate_de(individual_donor)
-                individual_donor.fitness.values = evaluated_donor[0:2]
-                individual_donor[1] = evaluated_donor[2]
-                # Selection
-                if (individual_donor.fitness.values[0] > agent.fitness.values[0]) and (individual_donor.fitness.values[1] > agent.fitness.values[1]):
-                    population_temporary.append(individual_donor)
-                    number_without_improvement_de = 0
-                elif (individual_donor.fitness.values[0] < agent.fitness.values[0]) and (individual_donor.fitness.values[1] < agent.fitness.values[1]):
-                    population_temporary.append(agent)
-                    number_without_improvement_de += 1
-                else:
-                    population_temporary.append(individual_donor)
-                    population_temporary.append(agent)
-                    number_without_improvement_de = 0
-            del population
-            population = toolbox.select_de(population_temporary)
-            gc.collect()
-        population_feasible = list()
-        for individual in range(len(population)):
-            if population[individual][1].is_feasible:
-                population_feasible.append(population[individual])
-        if len(population_feasible) > 0:
-            self.pareto_front_de = tools.sortLogNondominated(population_feasible, k=self.pareto_size, first_front_only=True)
+        return objectives, is_feasible
+
+    def evaluate_heat_loads(self, exchanger_addresses, heat_loads, objectives):
+        """Evaluate a heat load matrix on the reused evaluation network, writes the objectives in place and returns the feasibility"""
+        self.update_network(self.evaluation_network, exchanger_addresses, heat_loads)
+        objectives[:], is_feasible = self.network_objectives(self.evaluation_network)
+        return is_feasible
+
+    def evaluate_population(self, exchanger_addresses, energy_balance, heat_loads, objectives, feasibility):
+        """Two-stage evaluation of a population: HEX matches violating the linear energy balance get their penalty directly,
+        only the remaining ones are calculated on the network (or taken from the memo of evaluations if MemoDE is set)"""
+        self.number_evaluations += len(heat_loads)
+        violation_distances = energy_balance.violation_distances(heat_loads)
+        violated = violation_distances > 0
+        # Penalty of network_objectives without the temperature difference and mixer terms, which need the network
+        # calculation; the skipped terms are non-negative, so a prescreened violation is penalized at most as hard
+        objectives[violated] = (1 / (4 + self.number_heat_exchangers * violation_distances[violated]**2))[:, np.newaxis]
+        feasibility[violated] = False
+        if self.evaluation_memo.maxsize > 0:
+            topology = exchanger_addresses[:, [0, 1, 2, 7]].astype(int).tobytes()
+        for individual in np.flatnonzero(~violated):
+            if self.evaluation_memo.maxsize > 0:
+                key = (topology, heat_loads[individual].tobytes())
+                memorized = self.evaluation_memo.get(key)
+                if memorized is not None:
+                    self.number_memo_hits += 1
+                    objectives[individual], feasibility[individual] = memorized
+                    continue
+            feasibility[individual] = self.evaluate_heat_loads(exchanger_addresses, heat_loads[individual], objectives[individual])
+            if self.evaluation_memo.maxsize > 0:
+                self.evaluation_memo.put(key, (objectives[individual].copy(), feasibility[individual]))
+
+    @staticmethod
+    def front_hypervolume(objectives, feasibility, reference_point=None):
+        """Hypervolume of the feasible individuals in the space of the reversed objectives (costs relative to the initial
+        network); without a given reference point it is set to twice the maximal reversed objectives"""
+        reversed_objectives = 1 / objectives[feasibility]
+        if len(reversed_objectives) == 0:
+            return np.nan, reference_point
+        if reference_point is None:
+            reference_point = 2 * np.max(reversed_objectives, axis=0)
+        return hypervolume_2d(reversed_objectives, reference_point), reference_point
+
+    def is_converged(self, hypervolumes):
+        """Hypervolume stagnation: relative change of the feasible front's hypervolume over the sliding window"""
+        if self.hypervolume_tolerance <= 0 or len(hypervolumes) <= self.hypervolume_window:
+            return False
+        if hypervolumes[0] <= 0:
+            return False
+        return abs(hypervolumes[-1] - hypervolumes[0]) / hypervolumes[0] <= self.hypervolume_tolerance
+
+    def update_history(self, objectives, feasibility):
+        """Record the number of evaluations and the objectives of the feasible individuals (only if requested, e.g. for
+        comparisons of DE variants)"""
+        if self.record_history:
+            self.history.append((self.number_evaluations, objectives[feasibility].copy()))
+
+    def create_individual(self, exchanger_addresses, heat_loads, individual_class=None):
+        """Create a DE individual including its own network from a heat load matrix, its fitness is calculated on this
+        network (mixer types of streams with equal heat capacity flows are chosen randomly in each calculation); the class
+        defaults to creator.Individual_de"""
+        heat_exchanger_network = HeatExchangerNetwork(self.case_study)
+        self.update_network(heat_exchanger_network, exchanger_addresses, np.array(heat_loads))
+        if individual_class is None:
+            individual_class = creator.Individual_de
+        individual = individual_class([heat_loads.tolist(), heat_exchanger_network])
+        objectives, _ = self.network_objectives(heat_exchanger_network)
+        individual.fitness.values = tuple(objectives)
+        return individual
+
+    def resume_population(self, final_state, pool, topology):
+        """Restore the final population (heat loads, objectives, feasibility and control parameters) of an earlier run
+        on the same topology into the parents of a pool and return its size"""
+        number_individuals = len(final_state[0])
+        for pools, values in zip((self.heat_loads_pools, self.objectives_pools, self.feasibility_pools, self.control_parameter_pools), final_state[:4]):
+            pools[pool, 0, topology, :number_individuals] = values
+        return number_individuals
+
+    def initialize_run(self, run, topology, pool, initial_heat_loads=None, final_state=None):
+        """Initialize and evaluate the population of a topology in the parents of a pool (or resume it)"""
+        if final_state is not None:
+            run.number_generations = self.resume_generations
+            run.number_individuals = self.resume_population(final_state, pool, topology)
+            run.control_parameters.restore(final_state[4])
+            return
+        run.number_generations = self.number_generations
+        run.number_individuals = self.population_size
+        parents = self.heat_loads_pools[pool, 0, topology, :run.number_individuals]
+        run.bounds.sample(parents, self.initialization_design, run.generator)
+        if initial_heat_loads is not None:
+            self.seed_population(parents, initial_heat_loads, run.bounds)
+        if self.repair_energy_balance:
+            run.energy_balance.repair(parents, run.bounds.lower)
+        if self.snap_heat_loads:
+            run.bounds.snap(parents, self.absolute_heat_load_tolerance, self.repair_energy_balance)
+        run.control_parameters.initialize(self.control_parameter_pools[pool, 0, topology, :run.number_individuals])
+        self.evaluate_population(run.exchanger_addresses, run.energy_balance, parents, self.objectives_pools[pool, 0, topology, :run.number_individuals], self.feasibility_pools[pool, 0, topology, :run.number_individuals])
+
+    def select_population(self, run, topology, current, following, selection_size):
+        """Selection of the parents and evaluated trials of a topology in the current pool into the parents of the following
+        pool: trials dominated by their parent are discarded, parents dominated by their trial as well, the remaining
+        candidates are selected with NSGA-II"""
+        number_individuals = run.number_individuals
+        objectives = self.objectives_pools[current, :, topology]
+        donor_dominated = np.all(objectives[1, :number_individuals] < objectives[0, :number_individuals], axis=1)
+        agent_dominated = np.all(objectives[1, :number_individuals] > objectives[0, :number_individuals], axis=1)
+        improvements = np.flatnonzero(~donor_dominated)
+        run.control_parameters.update(self.control_parameter_pools[current, 1, topology, :number_individuals], ~donor_dominated, np.sum(objectives[1, :number_individuals] - objectives[0, :number_individuals], axis=1))
+        if len(improvements) == 0:
+            run.number_without_improvement += number_individuals
         else:
-            self.pareto_front_de = list()
+            run.number_without_improvement = number_individuals - 1 - improvements[-1]
+        survivors = np.flatnonzero(~agent_dominated)
+        halves = np.concatenate((np.zeros(len(survivors), dtype=int), np.ones(len(improvements), dtype=int)))
+        rows = np.concatenate((survivors, improvements))
+        selected = select_nsga2(-objectives[halves, rows], selection_size)
+        halves, rows = halves[selected], rows[selected]
+        run.number_individuals = len(selected)
+        for pools in (self.heat_loads_pools, self.objectives_pools, self.feasibility_pools, self.control_parameter_pools):
+            pools[following, 0, topology, :run.number_individuals] = pools[current, halves, topology, rows]
+
+    def is_running(self, run):
+        """Termination criteria: number of generations, generations without improvement and hypervolume stagnation"""
+        return run.generation <= run.number_generations and run.number_without_improvement <= self.number_no_improvement and \
+            not self.is_converged(run.hypervolumes)
+
+    def finish_run(self, run, topology, pool):
+        """Store the final state and the feasible pareto front of a topology whose parents are in a pool"""
+        number_individuals = run.number_individuals
+        heat_loads = self.heat_loads_pools[pool, 0, topology, :number_individuals]
+        objectives = self.objectives_pools[pool, 0, topology, :number_individuals]
+        feasibility = self.feasibility_pools[pool, 0, topology, :number_individuals]
+        run.final_state = (heat_loads.copy(), objectives.copy(), feasibility.copy(), self.control_parameter_pools[pool, 0, topology, :number_individuals].copy(),
+                           run.control_parameters.state())
+        population_feasible = np.flatnonzero(feasibility)
+        if len(population_feasible) > 0:
+            population_feasible = population_feasible[pareto_front(-objectives[population_feasible])]
+        run.result = (heat_loads[population_feasible], objectives[population_feasible])
+        run.is_finished = True
+
+    def optimize(self, exchanger_addresses, initial_heat_loads=None, final_state=None):
+        """Main differential evolution algorithm (optionally warm-started with heat loads of shape (seeds, exchangers,
+        operating cases) or resumed for ResumeGenDE generations from the final state of an earlier run)"""
+        results = self.optimize_batch([exchanger_addresses], [initial_heat_loads], [final_state])
+        self.final_state = self.final_states[0]
+        return results[0]
+
+    def optimize_batch(self, exchanger_addresses, initial_heat_loads=None, final_states=None):
+        """Differential evolution of several topologies in lockstep: the mutation, crossover and bound repair of all
+        populations is one array operation over (topologies, individuals, exchangers, operating cases), each topology is
+        evaluated, selected and terminated on its own. Each run draws from its own generator seeded in order of the
+        topologies, so a batch finds the same fronts as separate runs. The history is recorded for the first topology"""
+        number_topologies = len(exchanger_addresses)
+        if initial_heat_loads is None:
+            initial_heat_loads = [None] * number_topologies
+        if final_states is None:
+            final_states = [None] * number_topologies
+        self.allocate_buffers(number_topologies)
+        selection_size = min(2*self.pareto_size, self.population_size)
+        current, following = 0, 1
+        self.number_evaluations = 0
+        self.history = list()
+
+        # Initialize and evaluate populations
+        runs = list()
+        for topology in range(number_topologies):
+            addresses = np.array(exchanger_addresses[topology])
+            generator = np.random.default_rng(rng.integers(np.iinfo(np.int64).max))
+            run = DifferentialEvolutionRun(addresses, HeatLoadBounds(self.case_study, addresses, self.min_heat_load, self.tighten_bounds),
+                                           EnergyBalance(self.case_study, addresses), create_control_parameters(self.algorithm_parameter, generator),
+                                           self.hypervolume_window, generator)
+            self.initialize_run(run, topology, current, initial_heat_loads[topology], final_states[topology])
+            runs.append(run)
+        self.update_history(self.objectives_pools[current, 0, 0, :runs[0].number_individuals], self.feasibility_pools[current, 0, 0, :runs[0].number_individuals])
+        bounds = HeatLoadBounds.stack([run.bounds for run in runs])
+
+        for topology, run in enumerate(runs):
+            if not self.is_running(run):
+                self.finish_run(run, topology, current)
+        while not all(run.is_finished for run in runs):
+            # print('--DE: Generation %i --' % max(run.generation for run in runs))
+            number_individuals = np.array([run.number_individuals for run in runs])
+            for topology, run in enumerate(runs):
+                if not run.is_finished:
+                    run.generation += 1
+                    run.control_parameters.generate(self.control_parameter_pools[current, 0, topology, :run.number_individuals], self.control_parameter_pools[current, 1, topology, :run.number_individuals])
+            self.mutate_heat_loads(self.heat_loads_pools[current, 0, :number_topologies], self.heat_loads_pools[current, 1, :number_topologies], number_individuals, bounds, self.control_parameter_pools[current, 1, :number_topologies],
+                                   [run.generator for run in runs])
+            for topology, run in enumerate(runs):
+                if run.is_finished:
+                    continue
+                trials = self.heat_loads_pools[current, 1, topology, :run.number_individuals]
+                if self.repair_energy_balance:
+                    run.energy_balance.repair(trials, run.bounds.lower)
+                if self.snap_heat_loads:
+                    # Snapped after the repair (rounded down to keep the repaired balance), so that the memo keys repeat
+                    run.bounds.snap(trials, self.absolute_heat_load_tolerance, self.repair_energy_balance)
+                self.evaluate_population(run.exchanger_addresses, run.energy_balance, trials, self.objectives_pools[current, 1, topology, :run.number_individuals], self.feasibility_pools[current, 1, topology, :run.number_individuals])
+                self.select_population(run, topology, current, following, selection_size)
+            current, following = following, current
+            for topology, run in enumerate(runs):
+                if run.is_finished:
+                    continue
+                objectives = self.objectives_pools[current, 0, topology, :run.number_individuals]
+                feasibility = self.feasibility_pools[current, 0, topology, :run.number_individuals]
+                if topology == 0:
+                    self.update_history(objectives, feasibility)
+                if self.hypervolume_tolerance > 0:
+                    hypervolume, run.reference_point = self.front_hypervolume(objectives, feasibility, run.reference_point)
+                    if not np.isnan(hypervolume):
+                        run.hypervolumes.append(hypervolume)
+                if not self.is_running(run):
+                    self.finish_run(run, topology, current)
+
+        self.final_states = [run.final_state for run in runs]
+        return [run.result for run in runs]
+
+    def differential_evolution(self, exchanger_addresses, initial_heat_loads=None, final_state=None):
+        """Differential evolution of the heat loads of a topology, its pareto front is stored as DE individuals"""
+        heat_loads, objectives = self.optimize(exchanger_addresses, initial_heat_loads, final_state)
+        self.pareto_front_de = [self.create_individual(exchanger_addresses, heat_loads[individual]) for individual in range(len(heat_loads))]
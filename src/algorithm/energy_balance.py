@@ -0,0 +1,46 @@
+import numpy as np
+
+
+class EnergyBalance:
+    """Linear energy balance of the balance utility heat exchangers of a topology: their heat loads are the enthalpy
+    flows of the connected streams minus the heat loads of all HEX matches on these streams"""
+
+    def __init__(self, case_study, exchanger_addresses):
+        number_balance_utility_heat_exchangers = case_study.number_balance_utility_heat_exchangers
+        self.incidence = np.zeros([number_balance_utility_heat_exchangers, case_study.number_heat_exchangers])
+        self.enthalpy_flows = np.zeros([number_balance_utility_heat_exchangers, case_study.number_operating_cases])
+        self.active = np.zeros([number_balance_utility_heat_exchangers, case_study.number_operating_cases], dtype=bool)
+        for exchanger in case_study.range_balance_utility_heat_exchangers:
+            utility_type = case_study.initial_exchanger_balance_utilities['H/C'][exchanger]
+            connected_stream = int(case_study.initial_exchanger_balance_utilities['stream'][exchanger] - 1)
+            if utility_type == 'HU':
+                stream = case_study.cold_streams[connected_stream]
+                self.incidence[exchanger] = exchanger_addresses[:, 1] == connected_stream
+                self.enthalpy_flows[exchanger] = stream.heat_capacity_flows * (stream.target_temperatures - stream.supply_temperatures)
+            elif utility_type == 'CU':
+                stream = case_study.hot_streams[connected_stream]
+                self.incidence[exchanger] = exchanger_addresses[:, 0] == connected_stream
+                self.enthalpy_flows[exchanger] = stream.heat_capacity_flows * (stream.supply_temperatures - stream.target_temperatures)
+            self.active[exchanger] = np.logical_not(stream.is_soft)
+
+    def balance_utility_heat_loads(self, heat_loads):
+        """Heat loads of the balance utility heat exchangers for heat load matrices of shape (..., exchangers, operating cases)"""
+        return np.where(self.active, self.enthalpy_flows - np.einsum('be,...eo->...bo', self.incidence, heat_loads), 0.0)
+
+    def violation_distances(self, heat_loads):
+        """Summed absolute negative balance utility heat loads of heat load matrices of shape (..., exchangers, operating cases)"""
+        return np.sum(np.maximum(-self.balance_utility_heat_loads(heat_loads), 0.0), axis=(-2, -1))
+
+    def repair(self, heat_loads, minimal_heat_loads):
+        """Project heat load matrices of shape (..., exchangers, operating cases) in place onto non-negative balance utility
+        heat loads: the heat loads above their minimum are scaled down proportionally on each overloaded stream"""
+        adjustable_heat_loads = np.maximum(heat_loads - minimal_heat_loads, 0.0)
+        # The small margin keeps repaired streams clear of round-off in the temperature based network calculation
+        adjustable_enthalpy_flows = self.enthalpy_flows * (1 - 1e-9) - self.incidence @ minimal_heat_loads
+        adjustable_sums = np.einsum('be,...eo->...bo', self.incidence, adjustable_heat_loads)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaling_factors = np.clip(adjustable_enthalpy_flows / adjustable_sums, 0.0, 1.0)
+        scaling_factors[~np.broadcast_to(self.active, scaling_factors.shape) | (adjustable_sums == 0)] = 1.0
+        # Each match is scaled by the strongest reduction of the streams it is connected to
+        scaling_factors_exchangers = np.min(np.where(self.incidence[:, :, np.newaxis] == 1, scaling_factors[..., :, np.newaxis, :], 1.0), axis=-3)
+        heat_loads -= adjustable_heat_loads * (1 - scaling_factors_exchangers)
@@ -1,15 +1,21 @@
 from multiprocessing import Pool
 from timeit import default_timer as timer
 import copy as cp
-import bisect as bc
 import numpy as np
 from deap import tools
-from deap.tools._hypervolume import hv
 from deap import creator
 from deap import base
 rng = np.random.default_rng()
 
 from algorithm.differential_evolution import DifferentialEvolution
+from algorithm.genome import CanonicalForm, Genome
+from algorithm.hall_of_fame import HallOfFame, SpillingHallOfFame
+from algorithm.inner_optimizer import create_inner_optimizer
+from algorithm.match_feasibility import MatchFeasibilityIndex
+from algorithm.local_polishing import LocalPolishing
+from algorithm.lru_cache import LRUCache
+from algorithm.pareto import hypervolumes_2d, pareto_front
+from algorithm.topology_store import TopologyStore
 from heat_exchanger_network.heat_exchanger_network import HeatExchangerNetwork
 
 class GeneticAlgorithm:
@@ -19,29 +25,52 @@ class GeneticAlgorithm:
         self.case_study = case_study
         self.algorithm_parameter = algorithm_parameter
         self.heat_exchanger_network = HeatExchangerNetwork(case_study)
+        self.allele_type = Genome.allele_type(case_study)
+        self.canonical_form = CanonicalForm(case_study)
+        self.match_feasibility = MatchFeasibilityIndex(case_study) if algorithm_parameter.genetic_algorithm_match_index else None
+        self.number_store_hits = 0
+        self.number_memo_hits = 0
+        self.individual_class_de = None
+        self.reference_point = None
+        if algorithm_parameter.genetic_algorithm_reference_point not in ['population', 'fixed', 'monotonic']:
+            raise ValueError('Reference point "{0}" is invalid, choose population, fixed or monotonic.'.format(algorithm_parameter.genetic_algorithm_reference_point))
         self.differential_evolution = DifferentialEvolution(case_study, algorithm_parameter)
+        self.inner_optimizer = create_inner_optimizer(self.differential_evolution, algorithm_parameter)
+        self.final_states_de = LRUCache(algorithm_parameter.differential_evolution_resume_cache_size)
+        self.topology_results = LRUCache(algorithm_parameter.genetic_algorithm_cache_size, algorithm_parameter.genetic_algorithm_cache_memory * 2**20 if algorithm_parameter.genetic_algorithm_cache_memory > 0 else None,
+                                         lambda heat_loads: heat_loads.nbytes)
+        if algorithm_parameter.genetic_algorithm_store == 'none':
+            self.topology_store = None
+        else:
+            self.topology_store = TopologyStore(algorithm_parameter.genetic_algorithm_store, case_study, algorithm_parameter.objective_types, algorithm_parameter.genetic_algorithm_store_size)
+        if algorithm_parameter.differential_evolution_polishing == 'none':
+            self.local_polishing = None
+        else:
+            self.local_polishing = LocalPolishing(self.differential_evolution, algorithm_parameter.differential_evolution_polishing, algorithm_parameter.differential_evolution_polishing_evaluations)
 
-    def initialize_individual(self, individual_class):
+    def __getstate__(self):
+        """The stores of the master are not sent to the workers"""
+        state = self.__dict__.copy()
+        state['final_states_de'] = LRUCache(self.final_states_de.maxsize)
+        state['topology_results'] = LRUCache(0)
+        state['individual_class_de'] = None
+        return state
+
+    def initialize_individual(self):
         """Creates an individual (HEN topology) with the genes: hot_stream, cold_stream, enthalpy_stage, bypass_hot_stream (in DE determined),
            admixer_hot_stream (in DE determined), bypass_cold_stream (in DE determined), admixer_cold_stream (in DE determined), existent"""
-        exchanger_addresses = []
-        for _ in self.case_study.range_heat_exchangers:
+        individual = Genome.from_matrix(np.zeros([self.case_study.number_heat_exchangers, 8]), self.allele_type)
+        for exchanger in self.case_study.range_heat_exchangers:
             existent = rng.choice([True, False])
-            if existent:
-                hot_stream = rng.integers(0, self.case_study.number_hot_streams)
-                cold_stream = rng.integers(0, self.case_study.number_cold_streams)
-                enthalpy_stage = rng.integers(0, self.case_study.number_enthalpy_stages)
-            else:
-                hot_stream = 0
-                cold_stream = 0
-                enthalpy_stage = 0
-            bypass_hot_stream = 0
-            admixer_hot_stream = 0
-            bypass_cold_stream = 0
-            admixer_cold_stream = 0
-            exchanger_addresses.append([hot_stream, cold_stream, enthalpy_stage, bypass_hot_stream, admixer_hot_stream, bypass_cold_stream, admixer_cold_stream, existent])
-        exchanger_addresses = list(map(list, zip(*exchanger_addresses)))
-        individual = individual_class(np.transpose(exchanger_addresses).tolist())
+            if existent and self.match_feasibility is not None:
+                individual[exchanger, 0:3] = self.match_feasibility.sample_matches(None)
+                individual[exchanger, 7] = 1
+            elif existent:
+                individual[exchanger, 0] = rng.integers(0, self.case_study.number_hot_streams)
+                individual[exchanger, 1] = rng.integers(0, self.case_study.number_cold_streams)
+                individual[exchanger, 2] = rng.integers(0, self.case_study.number_enthalpy_stages)
+                individual[exchanger, 7] = 1
+        self.canonical_form(individual.alleles)
         return individual
     
     def initialize_pseudo_pareto_front_de(self, toolbox):
@@ -53,57 +82,261 @@ class GeneticAlgorithm:
         pseudo_population_de[0][1].exchanger_addresses.matrix = pseudo_exchanger_addresses
         return pseudo_population_de
 
-    def fitness_function(self, individual):
-        """Evaluation of HEN topology (if feasible DE population is generated and optimized)"""
-        quadratic_distance_split_infeasibility = (0 - self.heat_exchanger_network.split_heat_exchanger_violation_distance(individual))**2
-        quadratic_distance_utility_connection_infeasibility = (0 - self.heat_exchanger_network.utility_connections_violation_distance(individual))**2
-        quadratic_distance = quadratic_distance_split_infeasibility + quadratic_distance_utility_connection_infeasibility
-        if quadratic_distance > 0:
-            objective_one = 1 / (4 + quadratic_distance)
-            objective_two = 1 / (4 + quadratic_distance)
-            self.pseudo_pareto_front_de[0][1].exchanger_addresses.matrix = individual
-            self.pseudo_pareto_front_de[0].fitness.values = (objective_one, objective_two)
-            pareto_front_de = cp.deepcopy(self.pseudo_pareto_front_de)
+    @staticmethod
+    def parent_fronts(individual_ga):
+        """Exchanger addresses and heat loads of the feasible DE front members of an evaluated GA individual"""
+        heat_loads = [ind_de[0] for ind_de in individual_ga if np.sum(ind_de[0]) > 0.0 and ind_de[1].is_feasible]
+        if len(heat_loads) == 0:
+            return []
+        return [(np.array(individual_ga[0][2], dtype=int), np.array(heat_loads))]
+
+    def attach_parent_fronts(self, child, parent_fronts):
+        """Attach the parent DE fronts to an offspring for the warm start of its DE"""
+        if self.algorithm_parameter.differential_evolution_warm_start_fraction > 0:
+            child.parent_fronts = parent_fronts
+
+    @staticmethod
+    def inherited_exchangers(parent_addresses, exchanger_addresses):
+        """Parent slot of each existent HEX match of the offspring with the same streams and enthalpy stage (-1 if added or
+        changed): the canonical form may move inherited matches to other slots, the same slot is preferred"""
+        parent_matches = [tuple(match) for match in parent_addresses[:, 0:3]]
+        available = parent_addresses[:, 7] == 1
+        parent_slots = np.full(len(exchanger_addresses), -1)
+        for exchanger in np.flatnonzero(exchanger_addresses[:, 7] == 1):
+            match = tuple(exchanger_addresses[exchanger, 0:3])
+            candidates = [exchanger] + [slot for slot in range(len(parent_addresses)) if slot != exchanger]
+            parent_slot = next((slot for slot in candidates if available[slot] and parent_matches[slot] == match), -1)
+            if parent_slot >= 0:
+                parent_slots[exchanger] = parent_slot
+                available[parent_slot] = False
+        return parent_slots
+
+    def warm_start_heat_loads(self, individual):
+        """Map the heat loads of the parent DE fronts onto the HEX matches of the offspring, which the offspring inherited
+        (same streams and enthalpy stage, in whichever slot); added or changed matches stay NaN and are sampled in the DE"""
+        parent_fronts = getattr(individual, 'parent_fronts', [])
+        number_seeds = int(round(self.algorithm_parameter.differential_evolution_warm_start_fraction * self.algorithm_parameter.differential_evolution_population_size))
+        if len(parent_fronts) == 0 or number_seeds == 0:
+            return None
+        exchanger_addresses = np.array(individual, dtype=int)
+        parent_slots = [self.inherited_exchangers(parent_addresses, exchanger_addresses) for parent_addresses, _ in parent_fronts]
+        initial_heat_loads = np.full([number_seeds, self.case_study.number_heat_exchangers, self.case_study.number_operating_cases], np.nan)
+        for seed in range(number_seeds):
+            # Alternate the parent which is preferred and cycle through the members of its front
+            for parent in range(len(parent_fronts)):
+                _, parent_heat_loads = parent_fronts[(seed + parent) % len(parent_fronts)]
+                inherited_slots = parent_slots[(seed + parent) % len(parent_fronts)]
+                inherited = (inherited_slots >= 0) & np.isnan(initial_heat_loads[seed, :, 0])
+                initial_heat_loads[seed, inherited] = parent_heat_loads[seed % len(parent_heat_loads), inherited_slots[inherited]]
+        return initial_heat_loads
+
+    def topology_key(self, exchanger_addresses):
+        """Hashable key of the canonical form of a topology"""
+        return self.canonical_form.key(exchanger_addresses)
+
+    def is_resumable(self, exchanger_addresses):
+        """Whether a final DE population of the topology is stored"""
+        return self.algorithm_parameter.differential_evolution_resume_generations > 0 and self.topology_key(exchanger_addresses) in self.final_states_de
+
+    def attach_final_state(self, individual):
+        """Attach the stored final DE population of the topology of an individual before it is sent to the workers"""
+        if self.algorithm_parameter.differential_evolution_resume_generations > 0:
+            final_state = self.final_states_de.get(self.topology_key(individual))
+            if final_state is not None:
+                individual.final_state_de = final_state
+
+    def store_final_states(self, individuals, results):
+        """Store the final DE populations returned by the workers and return the DE pareto fronts"""
+        for individual, (_, final_state) in zip(individuals, results):
+            if final_state is not None and self.algorithm_parameter.differential_evolution_resume_generations > 0:
+                self.final_states_de.put(self.topology_key(individual), final_state)
+        return [pareto_front_de for pareto_front_de, _ in results]
+
+    def evaluate_topology(self, individual):
+        """Evaluation of a HEN topology screened as structurally feasible in the master (entry point of the workers), which
+        returns its DE pareto front, the final DE population and the number of evaluations taken from the memo (MemoDE)"""
+        number_memo_hits = self.differential_evolution.number_memo_hits
+        pareto_front_de = self.optimize_topology(individual)
+        return pareto_front_de, self.inner_optimizer.final_state, self.differential_evolution.number_memo_hits - number_memo_hits
+
+    def structural_violations(self, individuals):
+        """Quadratic distances of a batch of topologies to the split HEX and utility connection restrictions"""
+        exchanger_addresses = np.array([np.array(individual, dtype=int) for individual in individuals]).reshape(-1, self.case_study.number_heat_exchangers, 8)
+        quadratic_distances_split_infeasibility = self.heat_exchanger_network.split_heat_exchanger_violation_distances(exchanger_addresses)**2
+        quadratic_distances_utility_connection_infeasibility = self.heat_exchanger_network.utility_connections_violation_distances(exchanger_addresses)**2
+        return quadratic_distances_split_infeasibility + quadratic_distances_utility_connection_infeasibility
+
+    def pseudo_pareto_front(self, individual, objective):
+        """Pseudo DE pareto front of an individual without feasible heat loads"""
+        self.pseudo_pareto_front_de[0][1].exchanger_addresses.matrix = np.array(individual, dtype=int)
+        self.pseudo_pareto_front_de[0].fitness.values = (objective, objective)
+        return cp.deepcopy(self.pseudo_pareto_front_de)
+
+    def create_pareto_front(self, individual, heat_loads):
+        """DE pareto front of an individual from the heat loads of the pareto front of the inner optimizer"""
+        pareto_front_de = [self.differential_evolution.create_individual(individual, heat_loads[ind_de]) for ind_de in range(len(heat_loads))]
+        # Random mixer choices may render a member infeasible or dominated on its own network
+        pareto_front_de = [ind_de for ind_de in pareto_front_de if ind_de[1].is_feasible]
+        if len(pareto_front_de) == 0:
+            return self.pseudo_pareto_front(individual, 1 / 4)
+        objectives = np.array([ind_de.fitness.values for ind_de in pareto_front_de])
+        return [pareto_front_de[ind_de] for ind_de in pareto_front(-objectives)]
+
+    def optimize_topology(self, individual):
+        """DE pareto front of a structurally feasible HEN topology, whose heat loads are optimized by the inner optimizer
+        (by default the DE)"""
+        heat_loads, _ = self.inner_optimizer.optimize(individual, self.warm_start_heat_loads(individual), getattr(individual, 'final_state_de', None))
+        pareto_front_de = self.create_pareto_front(individual, heat_loads)
+        self.persist_pareto_front(individual, pareto_front_de)
+        return pareto_front_de
+
+    def evaluate_topologies(self, individuals):
+        """Evaluation of a batch of HEN topologies screened as structurally feasible in the master, which are optimized
+        together by the inner optimizer (in lockstep by the DE); returns the DE pareto front and final DE population of
+        each topology and the number of evaluations taken from the memo (MemoDE), which is counted for the whole batch with
+        its first topology"""
+        number_memo_hits = self.differential_evolution.number_memo_hits
+        fronts = self.inner_optimizer.optimize_batch(individuals, [self.warm_start_heat_loads(individual) for individual in individuals],
+                                                     [getattr(individual, 'final_state_de', None) for individual in individuals])
+        results = list()
+        for individual, (heat_loads, _), final_state in zip(individuals, fronts, self.inner_optimizer.final_states):
+            pareto_front_de = self.create_pareto_front(individual, heat_loads)
+            self.persist_pareto_front(individual, pareto_front_de)
+            results.append((pareto_front_de, final_state, 0))
+        results[0] = results[0][:2] + (self.differential_evolution.number_memo_hits - number_memo_hits,)
+        return results
+
+    def is_cacheable(self, individual):
+        """Whether the DE pareto front of a topology is looked up in the topology cache (CacheGA) and store (StoreGA); resumed
+        topologies are always sent to the workers"""
+        return (self.topology_results.maxsize > 0 or self.topology_store is not None) and individual.final_state_de is None
+
+    def front_heat_loads(self, pareto_front_de):
+        """Heat loads (members, exchangers, operating cases) of the feasible members of a DE pareto front"""
+        heat_loads = [ind_de[0] for ind_de in pareto_front_de if np.sum(ind_de[0]) > 0.0 and ind_de[1].is_feasible]
+        return np.array(heat_loads, dtype=float).reshape(-1, self.case_study.number_heat_exchangers, self.case_study.number_operating_cases)
+
+    def persist_pareto_front(self, individual, pareto_front_de):
+        """Write the heat loads and objectives of the feasible members of the DE pareto front of a topology to the
+        persistent topology store (StoreGA)"""
+        if self.topology_store is None:
+            return
+        objectives = [ind_de.fitness.values for ind_de in pareto_front_de if np.sum(ind_de[0]) > 0.0 and ind_de[1].is_feasible]
+        self.topology_store.put(self.topology_key(individual), self.front_heat_loads(pareto_front_de), np.array(objectives, dtype=float))
+
+    def lookup_heat_loads(self, individual):
+        """Heat loads of the DE pareto front of a topology from the topology cache or else the persistent topology store
+        (None if stored in neither)"""
+        heat_loads = self.topology_results.get(self.topology_key(individual))
+        if heat_loads is None and self.topology_store is not None:
+            stored = self.topology_store.get(self.topology_key(individual))
+            if stored is not None:
+                heat_loads = stored[0]
+                self.number_store_hits += 1
+                if self.topology_results.maxsize > 0:
+                    self.topology_results.put(self.topology_key(individual), heat_loads)
+        return heat_loads
+
+    def evaluate_individuals(self, individuals):
+        """Evaluation of HEN topologies: structurally infeasible topologies are screened out together and get their pseudo
+        DE pareto front in the master, topologies stored in the topology cache are rebuilt from it, only the remaining ones
+        are sent to the workers (in batches of BatchDE topologies if BatchDE > 1), which do not screen them again"""
+        results = [None] * len(individuals)
+        dispatched = list()
+        duplicates = list()
+        pending = dict()
+        for individual_index, quadratic_distance in enumerate(self.structural_violations(individuals)):
+            individual = individuals[individual_index]
+            if quadratic_distance > 0:
+                results[individual_index] = (self.pseudo_pareto_front(individual, 1 / (4 + quadratic_distance)), None)
+            elif not self.is_cacheable(individual):
+                dispatched.append(individual_index)
+            elif self.topology_key(individual) in pending:
+                # Topology already sent to the workers in this evaluation
+                duplicates.append(individual_index)
+            else:
+                heat_loads = self.lookup_heat_loads(individual)
+                if heat_loads is None:
+                    pending[self.topology_key(individual)] = individual_index
+                    dispatched.append(individual_index)
+                else:
+                    results[individual_index] = (self.create_pareto_front(individual, heat_loads), None)
+        dispatched_individuals = [individuals[individual_index] for individual_index in dispatched]
+        batch_size = self.algorithm_parameter.differential_evolution_batch_size
+        if batch_size <= 1:
+            results_dispatched = self.map_workers(self.evaluate_topology, dispatched_individuals)
         else:
-            self.differential_evolution.differential_evolution(individual)
-            pareto_front_de = cp.deepcopy(self.differential_evolution.pareto_front_de)
-            if len(pareto_front_de) == 0:
-                objective_one = 1 / 4
-                objective_two = 1 / 4
-                self.pseudo_pareto_front_de[0][1].exchanger_addresses.matrix = individual
-                self.pseudo_pareto_front_de[0].fitness.values = (objective_one, objective_two)
-                pareto_front_de = cp.deepcopy(self.pseudo_pareto_front_de)
-        return pareto_front_de  
-
-    def update_hall_of_fame(self, population, hall_of_fame):
-        """Custom update function of the hall of fame update using the fitness attribute indicator instead of fitness"""
-        for ind in population:
-            duplicate = False
-            if len(hall_of_fame) == 0 and hall_of_fame.maxsize !=0:
-                self.insert_hall_of_fame_item(population[0], hall_of_fame)
-                continue
-            if ind.indicator > hall_of_fame[0].indicator or len(hall_of_fame) < hall_of_fame.maxsize:
-                for hofer in range(len(hall_of_fame)):
-                    if all([np.array_equal(ind[0][2], hall_of_fame[hofer][0][2]), ind.indicator == hall_of_fame[hofer].indicator]):
-                        duplicate = True
-                        break                 
-                if duplicate:
-                    continue
-                if len(hall_of_fame) >= hall_of_fame.maxsize:
-                    self.remove_hall_of_fame_item(hall_of_fame, 0)
-                self.insert_hall_of_fame_item(ind, hall_of_fame)
-        
-    def insert_hall_of_fame_item(self, item, hall_of_fame):
-        """Custom insert function of the hall of fame insert using the fitness attribute indicator instead of fitness"""
-        item = cp.deepcopy(item)
-        i = bc.bisect_right([key.wvalues[0] for key in hall_of_fame.keys],item.indicator.wvalues[0])
-        hall_of_fame.items.insert(i, item)
-        hall_of_fame.keys.insert(i, item.indicator)
-
-    def remove_hall_of_fame_item(self, hall_of_fame, index):
-        """Custom remove function of the hall of fame remove"""
-        del hall_of_fame.keys[index]
-        del hall_of_fame.items[index]
+            batches = [dispatched_individuals[batch:batch + batch_size] for batch in range(0, len(dispatched_individuals), batch_size)]
+            results_dispatched = [result for results_batch in self.map_workers(self.evaluate_topologies, batches) for result in results_batch]
+        for individual_index, (pareto_front_de, final_state, number_memo_hits) in zip(dispatched, results_dispatched):
+            results[individual_index] = (pareto_front_de, final_state)
+            self.number_memo_hits += number_memo_hits
+            if self.topology_results.maxsize > 0:
+                self.topology_results.put(self.topology_key(individuals[individual_index]), self.front_heat_loads(pareto_front_de))
+        for individual_index in duplicates:
+            heat_loads = self.front_heat_loads(results[pending[self.topology_key(individuals[individual_index])]][0])
+            results[individual_index] = (self.create_pareto_front(individuals[individual_index], heat_loads), None)
+        return results
+
+    def polish_pareto_front(self, individual_ga):
+        """Local polishing of all feasible DE pareto front members of a GA individual, returns its new DE pareto front"""
+        exchanger_addresses = np.array(individual_ga[0][2], dtype=int)
+        polished_front = list()
+        for ind_de in individual_ga:
+            if np.sum(ind_de[0]) > 0.0 and ind_de[1].is_feasible:
+                result = self.local_polishing.polish(exchanger_addresses, ind_de[0], ind_de.fitness.values)
+                if result is not None:
+                    # Confirm the polished heat loads on the network of the new individual
+                    polished = self.differential_evolution.create_individual(exchanger_addresses, result[0])
+                    if polished[1].is_feasible and self.local_polishing.dominates(polished.fitness.values, ind_de.fitness.values):
+                        polished.append(polished[1].exchanger_addresses.matrix)
+                        ind_de = polished
+            polished_front.append(ind_de)
+        objectives = np.array([ind_de.fitness.values for ind_de in polished_front])
+        return [polished_front[individual] for individual in pareto_front(-objectives)]
+
+    def polish_elite(self, population_ga):
+        """Local polishing of the DE pareto fronts of the elite GA individuals, which were not polished yet"""
+        elite = tools.selBest(population_ga, k=self.algorithm_parameter.genetic_algorithm_polishing_elite_size, fit_attr='indicator')
+        elite = [individual_ga for individual_ga in elite if not getattr(individual_ga, 'polished', False) and individual_ga.indicator.values[0] > 0]
+        if len(elite) == 0:
+            return
+        results_polishing = self.map_workers(self.polish_pareto_front, elite)
+        for individual_ga, polished_front in zip(elite, results_polishing):
+            individual_ga[:] = polished_front
+            del individual_ga.indicator.values
+            individual_ga.polished = True
+        self.evaluate_hypervolume(population_ga)
+
+    def map_workers(self, function, individuals):
+        """Map a function over individuals, distributed over NumProcessors workers (all processors if not given)"""
+        if len(individuals) == 0:
+            return []
+        if self.algorithm_parameter.number_workers == 1:
+            return list(map(function, individuals))
+        elif np.isnan(self.algorithm_parameter.number_workers):
+            with Pool() as worker:
+                return list(worker.map(function, individuals))
+        else:
+            with Pool(self.algorithm_parameter.number_workers) as worker:
+                return list(worker.map(function, individuals))
+
+    def create_hall_of_fame(self):
+        """Hall of fame of the GA, spilled to the file HoFFileGA if given"""
+        if self.algorithm_parameter.genetic_algorithm_hall_of_fame_file == 'none':
+            return HallOfFame(self.algorithm_parameter.genetic_algorithm_hall_of_fame_size, self.topology_key)
+        number_members = min(2 * self.algorithm_parameter.differential_evolution_pareto_size, self.algorithm_parameter.differential_evolution_population_size)
+        return SpillingHallOfFame(self.algorithm_parameter.genetic_algorithm_hall_of_fame_size, self.topology_key, self.algorithm_parameter.genetic_algorithm_hall_of_fame_file,
+                                  number_members, self.case_study.number_heat_exchangers, self.case_study.number_operating_cases, len(self.algorithm_parameter.objective_types),
+                                  self.rebuild_pareto_front)
+
+    def rebuild_pareto_front(self, exchanger_addresses, heat_loads):
+        """DE pareto front (with the networks of its members) of a topology from the heat loads of its members; the DE
+        individual class is kept, as spilled hall of fame records are rebuilt after the creator classes are deleted"""
+        pareto_front_de = [self.differential_evolution.create_individual(exchanger_addresses, heat_loads[ind_de], self.individual_class_de) for ind_de in range(len(heat_loads))]
+        for ind_de in pareto_front_de:
+            ind_de.append(ind_de[1].exchanger_addresses.matrix)
+        return pareto_front_de
 
     def update_population_ga(self, toolbox, results_de):
         """Creates a new population based on the results of the differential evolution"""
@@ -116,119 +349,135 @@ class GeneticAlgorithm:
                 ind_de += 1
         return population_ga
 
+    def update_reference_point(self, fitnesses_reversed):
+        """Reference point of the GA indicator in the space of the reversed objectives (costs relative to the initial
+        network): ReferenceFactorGA times the maximal reversed fitnesses of the feasible DE individuals of the population
+        (population), of the first population with feasible ones (fixed) or of all populations so far (monotonic).
+        Returns whether the reference point changed"""
+        reference_point = self.reference_point
+        if len(fitnesses_reversed) > 0:
+            population_reference_point = self.algorithm_parameter.genetic_algorithm_reference_factor * np.max(fitnesses_reversed, axis=0)
+            if self.algorithm_parameter.genetic_algorithm_reference_point == 'population' or reference_point is None:
+                reference_point = population_reference_point
+            elif self.algorithm_parameter.genetic_algorithm_reference_point == 'monotonic':
+                reference_point = np.maximum(reference_point, population_reference_point)
+        changed = reference_point is None or self.reference_point is None or not np.array_equal(reference_point, self.reference_point)
+        self.reference_point = reference_point
+        return changed
+
     def evaluate_hypervolume(self, population_ga):
-        """Evaluates the hypervolumes of all differential evolution pareto fronts. These values are used for the selection in the GA algorithm"""
-        fitnesses_reversed = []
-        for _, individual_ga in enumerate(population_ga):
-            ind_de = 0
-            while ind_de < len(individual_ga):
-                if np.sum(individual_ga[ind_de][0]) > 0.0 and individual_ga[ind_de][1].is_feasible:
-                    fitnesses_reversed.append([1/individual_ga[ind_de].fitness.wvalues[0], 1/individual_ga[ind_de].fitness.wvalues[1]])
-                ind_de += 1
-        fitnesses_reversed = np.array(fitnesses_reversed)
-        for _, individual_ga in enumerate(population_ga):
-            if len(individual_ga) <=1 and np.sum(individual_ga[0][0]) == 0.0:
-                individual_ga.indicator.values = 0.0,
-            else:
-                reference_point = (np.max(fitnesses_reversed[:,0])*2, np.max(fitnesses_reversed[:,1])*2)
-                fitnesses_reversed_de = np.array([[1/ind_de.fitness.wvalues[0], 1/ind_de.fitness.wvalues[1]] for ind_de in individual_ga])
-                individual_ga.indicator.values = hv.hypervolume(fitnesses_reversed_de, reference_point),
-
-    def reformat_individual_evolution(self, individual_de):
-        """Reformat the DE individual for the GA evolution and optimization"""
-        del individual_de[0][0:2]
-        if not isinstance(individual_de[0][0], list):
-            individual_de[0][0:7] = individual_de[0][0].tolist()
-        if len(individual_de[0]) < 7:
-            individual_de = cp.copy(individual_de[0])
-        del individual_de[0].fitness.values
-        return individual_de[0]
+        """Evaluates the hypervolumes of all differential evolution pareto fronts in one pass. These values are used for the selection in the GA algorithm.
+        With a reference point which is not recomputed from the population (ReferenceGA), only individuals without a valid
+        indicator are evaluated as long as the reference point is unchanged"""
+        fitnesses_reversed = 1 / np.array([ind_de.fitness.wvalues for individual_ga in population_ga for ind_de in individual_ga])
+        feasible = np.array([np.sum(ind_de[0]) > 0.0 and ind_de[1].is_feasible for individual_ga in population_ga for ind_de in individual_ga])
+        changed = self.update_reference_point(fitnesses_reversed[feasible])
+        if changed or self.algorithm_parameter.genetic_algorithm_reference_point == 'population':
+            population_ga = list(population_ga)
+        else:
+            population_ga = [individual_ga for individual_ga in population_ga if not individual_ga.indicator.valid]
+        fitnesses_reversed = 1 / np.array([ind_de.fitness.wvalues for individual_ga in population_ga for ind_de in individual_ga]).reshape(-1, 2)
+        fronts = np.repeat(np.arange(len(population_ga)), [len(individual_ga) for individual_ga in population_ga])
+        evaluated = np.array([not (len(individual_ga) <= 1 and np.sum(individual_ga[0][0]) == 0.0) for individual_ga in population_ga], dtype=bool)
+        hypervolumes = np.zeros(len(population_ga))
+        if self.reference_point is not None:
+            hypervolumes = np.where(evaluated, hypervolumes_2d(fitnesses_reversed, fronts, self.reference_point, len(population_ga)), 0.0)
+        for individual_ga, hypervolume in zip(population_ga, hypervolumes):
+            individual_ga.indicator.values = hypervolume,
+
+    def create_offspring(self, offspring):
+        """Genome tensor (population, exchangers, 8) of copies of the topologies of the DE pareto fronts of the selected
+        GA individuals"""
+        return np.array([individual_ga[0][2] for individual_ga in offspring], dtype=self.allele_type)
 
     @staticmethod
-    def crossover(child_1, child_2):
-        """Crossover operator of genes"""
-        cxpoint = rng.integers(1, len(child_1))
-        child_1[cxpoint:], child_2[cxpoint:] = child_2[cxpoint:].copy(), child_1[cxpoint:].copy()
-
-    def mutation(self, individual):
-        """Mutation operator of alleles: uniform distribution for process streams and enthalpy intervals, bounded by their max and min values,
-         and random bit flip for the existence of a heat exchanger"""
-        mutated = False
-        allele_numbers = [7, 2, 1, 0]
-        exchanger_number = 0
-        while exchanger_number < self.case_study.number_heat_exchangers:
-            allele_index = 0
-            while allele_index < len(allele_numbers):
-                if allele_numbers[allele_index] == 7 and \
-                   rng.random() < self.algorithm_parameter.genetic_algorithm_probability_mutation:
-                    mutated = True
-                    individual[exchanger_number][7] = not individual[exchanger_number][7]
-                    if individual[exchanger_number][7]:
-                        individual[exchanger_number][0] = rng.integers(0, self.case_study.number_hot_streams)
-                        individual[exchanger_number][1] = rng.integers(0, self.case_study.number_cold_streams)
-                        individual[exchanger_number][2] = rng.integers(0, self.case_study.number_enthalpy_stages)
-                        break
-                    else:
-                        individual[exchanger_number][0] = 0
-                        individual[exchanger_number][1] = 0
-                        individual[exchanger_number][2] = 0
-                        break
-                elif allele_numbers[allele_index] == 2 and \
-                     individual[exchanger_number][7] and \
-                     rng.random() < self.algorithm_parameter.genetic_algorithm_probability_mutation:
-                    mutated = True
-                    individual[exchanger_number][2] = rng.integers(0, self.case_study.number_enthalpy_stages)
-                    allele_index += 1
-                elif allele_numbers[allele_index] == 1 and \
-                     individual[exchanger_number][7] and  \
-                     rng.random() < self.algorithm_parameter.genetic_algorithm_probability_mutation:
-                    mutated = True
-                    individual[exchanger_number][1] = rng.integers(0, self.case_study.number_cold_streams)
-                    allele_index += 1
-                elif allele_numbers[allele_index] == 0 and \
-                     individual[exchanger_number][7] and \
-                     rng.random() < self.algorithm_parameter.genetic_algorithm_probability_mutation:
-                    mutated = True
-                    individual[exchanger_number][0] = rng.integers(0, self.case_study.number_hot_streams)
-                    allele_index += 1
-                else:
-                    allele_index += 1
-            exchanger_number += 1
-        return mutated
-        
+    def create_survivor(individual_ga):
+        """Unchanged GA individual for the next generation, which shares the DE pareto front and the indicator of its
+        parent"""
+        survivor = creator.ParetoIndividual_ga(individual_ga)
+        survivor.indicator.values = individual_ga.indicator.values
+        if getattr(individual_ga, 'polished', False):
+            survivor.polished = True
+        return survivor
+
+    def select_unique(self, population_ga, k):
+        """Selection of the k best GA individuals by their indicator, which rejects duplicates (same canonical topology as a
+        better individual) unless fewer than k distinct topologies are left"""
+        ranked = tools.selBest(population_ga, k=len(population_ga), fit_attr='indicator')
+        unique = list()
+        duplicates = list()
+        topology_keys = set()
+        for individual_ga in ranked:
+            topology_key = self.topology_key(individual_ga[0][2])
+            (duplicates if topology_key in topology_keys else unique).append(individual_ga)
+            topology_keys.add(topology_key)
+        return (unique + duplicates)[:k]
+
+    @staticmethod
+    def tournament_selection(population_ga, k, tournsize):
+        """Tournament selection of k GA individuals, each the best of tournsize randomly drawn aspirants by their indicator
+        (the first drawn one on ties)"""
+        indicators = np.array([individual_ga.indicator.wvalues[0] for individual_ga in population_ga])
+        aspirants = rng.integers(0, len(population_ga), size=(k, tournsize))
+        winners = aspirants[np.arange(k), np.argmax(indicators[aspirants], axis=1)]
+        return [population_ga[winner] for winner in winners]
+
+    @staticmethod
+    def crossover(genomes, crossed):
+        """One-point crossover of the genomes of the pairs (0, 1), (2, 3), ... of a genome tensor, whose crossed flag is set:
+        the exchangers from a random crossover point onwards are swapped"""
+        children_1, children_2 = genomes[0:2*len(crossed):2][crossed], genomes[1:2*len(crossed):2][crossed]
+        cxpoints = rng.integers(1, genomes.shape[1], size=len(children_1))
+        swapped = (np.arange(genomes.shape[1]) >= cxpoints[:, np.newaxis])[..., np.newaxis]
+        genomes[0:2*len(crossed):2][crossed], genomes[1:2*len(crossed):2][crossed] = np.where(swapped, children_2, children_1), np.where(swapped, children_1, children_2)
+
+    def mutation(self, genomes):
+        """Mutation operator of alleles of a genome tensor: uniform distribution for process streams and enthalpy intervals, bounded by their max and min values,
+         and random bit flip for the existence of a heat exchanger. A flipped exchanger gets new streams and enthalpy stage
+         if added (reset to zero if removed), otherwise the streams and stage of existent exchangers mutate independently.
+         With MatchIndexGA the streams are drawn among the viable matches only. Returns which genomes mutated"""
+        mutations = rng.random(genomes.shape[:2] + (4,)) < self.algorithm_parameter.genetic_algorithm_probability_mutation
+        flipped = mutations[..., 0]
+        existent = genomes[..., 7] == 1
+        added = flipped & ~existent
+        removed = flipped & existent
+        # Alleles hot stream, cold stream and enthalpy stage
+        resampled = added[..., np.newaxis] | ((existent & ~flipped)[..., np.newaxis] & mutations[..., [3, 2, 1]])
+        if self.match_feasibility is None:
+            draws = rng.integers(0, [self.case_study.number_hot_streams, self.case_study.number_cold_streams, self.case_study.number_enthalpy_stages], size=genomes.shape[:2] + (3,))
+            np.copyto(genomes[..., 0:3], draws, where=resampled, casting='unsafe')
+        else:
+            genomes[..., 0:3] = self.match_feasibility.resample(genomes[..., 0:3].astype(int), added, resampled)
+        genomes[..., 0:3][removed] = 0
+        genomes[..., 7][flipped] = 1 - genomes[..., 7][flipped]
+        return np.any(flipped | np.any(resampled, axis=-1), axis=1)
+
     def genetic_algorithm(self):
         """Genetic algorithm (topology optimization)"""
         # GA: Create GA classes
-        creator.create('FitnessMin_ga', base.Fitness, weights=(1.0, 1.0))
-        creator.create('Individual_ga', list, fitness=creator.FitnessMin_ga) 
         creator.create('HyperVolumeIndicator_ga', base.Fitness, weights=(1.0,))
         creator.create('ParetoIndividual_ga', list, indicator=creator.HyperVolumeIndicator_ga)
         # DE: Create DE classes
         creator.create('FitnessMin_de', base.Fitness, weights=(1.0,1.0))
         creator.create('Individual_de', list, fitness=creator.FitnessMin_de)
+        self.individual_class_de = creator.Individual_de
         # GA: Define individuals of exchanger address matrices: 
         toolbox = base.Toolbox()
-        toolbox.register('individual_ga', self.initialize_individual, creator.Individual_ga)
+        toolbox.register('individual_ga', self.initialize_individual)
         toolbox.register('initial_population_ga', tools.initRepeat, list, toolbox.individual_ga)
         toolbox.register('population_pareto', tools.initRepeat, list, creator.ParetoIndividual_ga)
-        toolbox.register('evaluate_ga', self.fitness_function)
-        toolbox.register('select_ga', tools.selTournament, k=self.algorithm_parameter.genetic_algorithm_population_size, tournsize=self.algorithm_parameter.genetic_algorithm_tournament_size)
+        toolbox.register('select_ga', self.tournament_selection, k=self.algorithm_parameter.genetic_algorithm_population_size, tournsize=self.algorithm_parameter.genetic_algorithm_tournament_size)
+        toolbox.register('clone_ga', self.create_offspring)
         toolbox.register('mate_ga', self.crossover)
         toolbox.register('mutate_ga', self.mutation)
         # GA: Create a pseudo DE population for infeasible GA individuals
         self.pseudo_pareto_front_de = self.initialize_pseudo_pareto_front_de(toolbox)
         # GA: Generate population
         population_initial = toolbox.initial_population_ga(self.algorithm_parameter.genetic_algorithm_population_size)
-        hall_of_fame = tools.HallOfFame(maxsize=self.algorithm_parameter.genetic_algorithm_hall_of_fame_size) 
+        hall_of_fame = self.create_hall_of_fame()
         # GA: Evaluate entire population 
-        if self.algorithm_parameter.number_workers == 1:
-            results_de = list(map(toolbox.evaluate_ga, population_initial)) 
-        elif np.isnan(self.algorithm_parameter.number_workers):
-            with Pool() as worker: 
-                results_de = list(worker.map(toolbox.evaluate_ga, population_initial))
-        else:
-            with Pool(self.algorithm_parameter.number_workers) as worker:
-                results_de = list(worker.map(toolbox.evaluate_ga, population_initial))
+        results_de = self.evaluate_individuals(population_initial)
+        results_de = self.store_final_states(population_initial, results_de)
         population_ga = self.update_population_ga(toolbox, results_de)
 
         self.evaluate_hypervolume(population_ga)
@@ -240,70 +489,46 @@ class GeneticAlgorithm:
             number_generations_ga += 1
             print('--GA: Generation %i --' % number_generations_ga)
             # GA: Select the next generation of individuals 
-            offspring = toolbox.select_ga(population_ga, fit_attr="indicator") 
-            # GA: Clone selected individuals and bring offspring in initial population design
-            offspring = list(toolbox.map(toolbox.clone, offspring))
-            # GA: crossover
-            invalid_individuals = toolbox.initial_population_ga(0) 
-            valid_individuals = toolbox.initial_population_ga(0) 
-            for child_1, child_2 in zip(offspring[::2], offspring[1::2]):
-                if rng.random() < self.algorithm_parameter.genetic_algorithm_probability_crossover:
-                    child_1 = self.reformat_individual_evolution(child_1)
-                    child_2 = self.reformat_individual_evolution(child_2)
-                    toolbox.mate_ga(child_1, child_2)
-                    toolbox.mutate_ga(child_1)
-                    toolbox.mutate_ga(child_2)
-                    invalid_individuals.append(child_1)
-                    invalid_individuals.append(child_2)
-                else:
-                    child_1_temporary = cp.deepcopy(child_1)
-                    child_1_temporary = self.reformat_individual_evolution(child_1_temporary)
-                    child_2_temporary = cp.deepcopy(child_2)
-                    child_2_temporary = self.reformat_individual_evolution(child_2_temporary)
-                    mutated_child_1 = toolbox.mutate_ga(child_1_temporary)
-                    mutated_child_2 = toolbox.mutate_ga(child_2_temporary)
-                    if mutated_child_1:
-                        invalid_individuals.append(child_1_temporary)
-                    else:
-                        del child_1.indicator.values
-                        valid_individuals.append(child_1)
-                    if mutated_child_2:
-                        invalid_individuals.append(child_2_temporary)
-                    else:
-                        del child_2.indicator.values
-                        valid_individuals.append(child_2)
-
-            if not len(offspring) % 2 == 0:
-                last_individual = offspring[-1]
-                last_individual_temporary = cp.deepcopy(offspring[-1])
-                last_individual_temporary = self.reformat_individual_evolution(last_individual_temporary)
-                mutated = toolbox.mutate_ga(last_individual_temporary)
-                if mutated:
-                    invalid_individuals.append(last_individual_temporary)
+            offspring = toolbox.select_ga(population_ga)
+            # GA: crossover and mutation of the offspring genome tensor (copies of the topologies of the selected individuals)
+            genomes = toolbox.clone_ga(offspring)
+            crossed = rng.random(len(offspring) // 2) < self.algorithm_parameter.genetic_algorithm_probability_crossover
+            toolbox.mate_ga(genomes, crossed)
+            mutated = toolbox.mutate_ga(genomes)
+            self.canonical_form(genomes)
+            invalid_individuals = []
+            valid_individuals = []
+            for individual_index, parent in enumerate(offspring):
+                child = Genome(genomes[individual_index])
+                pair = individual_index // 2
+                if pair < len(crossed) and crossed[pair]:
+                    self.attach_parent_fronts(child, self.parent_fronts(offspring[2*pair]) + self.parent_fronts(offspring[2*pair + 1]))
+                    invalid_individuals.append(child)
+                elif mutated[individual_index]:
+                    self.attach_parent_fronts(child, self.parent_fronts(parent))
+                    invalid_individuals.append(child)
+                elif self.algorithm_parameter.differential_evolution_refine_survivors and self.is_resumable(child):
+                    invalid_individuals.append(child)
                 else:
-                    del last_individual.indicator.values
-                    valid_individuals.append(last_individual)
+                    valid_individuals.append(self.create_survivor(parent))
 
-            if self.algorithm_parameter.number_workers == 1:
-                results_de = list(map(toolbox.evaluate_ga, invalid_individuals))
+            for individual in invalid_individuals:
+                self.attach_final_state(individual)
+            results_de = self.evaluate_individuals(invalid_individuals)
+            results_de = self.store_final_states(invalid_individuals, results_de)
 
-            elif np.isnan(self.algorithm_parameter.number_workers):
-                with Pool() as worker: 
-                    results_de = list(worker.map(toolbox.evaluate_ga, invalid_individuals))
-            else:
-                with Pool(self.algorithm_parameter.number_workers) as worker: 
-                    results_de = list(worker.map(toolbox.evaluate_ga, invalid_individuals))
-            
             population_ga_updated = self.update_population_ga(toolbox, results_de)
             for _, valid_individual in enumerate(valid_individuals):
                 population_ga_updated.append(valid_individual)
 
             self.evaluate_hypervolume(population_ga_updated)
-            population_ga = tools.selBest(population_ga_updated, k=self.algorithm_parameter.genetic_algorithm_population_size, fit_attr="indicator")
+            population_ga = self.select_unique(population_ga_updated, self.algorithm_parameter.genetic_algorithm_population_size)
+            if self.local_polishing is not None:
+                self.polish_elite(population_ga)
 
             # GA: Update Hall of Fame
-            self.update_hall_of_fame(population_ga, hall_of_fame)
-            if hall_of_fame[-1].indicator.wvalues[0] > 0:
+            hall_of_fame.update(population_ga)
+            if len(hall_of_fame) > 0 and hall_of_fame[-1].indicator.wvalues[0] > 0:
                 print('TAC:', hall_of_fame[-1][0][1].total_annual_cost)
                 print('CO2:', hall_of_fame[-1][0][1].operating_emissions)
                 print('indicator:', hall_of_fame[-1].indicator.values[0])
@@ -313,6 +538,12 @@ class GeneticAlgorithm:
         print('-- End of evolution --')
         end = timer()
         print('Computation time: %s s' % (end - start))
+        if self.topology_store is not None:
+            print('Topology store: {0} hits'.format(self.number_store_hits))
+        if self.algorithm_parameter.differential_evolution_memo_size > 0:
+            print('DE evaluation memo: {0} hits'.format(self.number_memo_hits))
+        if self.topology_results.maxsize > 0:
+            print('Topology cache: {hits} hits, {misses} misses, {evictions} evictions, {entries} entries'.format(**self.topology_results.statistics()))
         print('Hall of fame list:')
         for i in reversed(range(len(hall_of_fame))):
             print('Rank:', len(hall_of_fame)- i)
@@ -322,8 +553,6 @@ class GeneticAlgorithm:
             print('GA chromosome\n:', hall_of_fame[i][0][2])
             print('DE chromosome\n:', np.array(hall_of_fame[i][0][0]))
             print(10*'-')
-        del creator.FitnessMin_ga
-        del creator.Individual_ga
         del creator.FitnessMin_de
         del creator.Individual_de
         return hall_of_fame
@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class Genome:
+    """Topology of a GA offspring: exchanger address matrix (exchangers, 8) of small integers with the alleles
+    hot_stream, cold_stream, enthalpy_stage, bypass_hot_stream, admixer_hot_stream, bypass_cold_stream,
+    admixer_cold_stream, existent. The evaluation results are kept apart in the pareto individuals of the GA, so that
+    offspring are created by copying the allele array only (the GA clones its offspring as one genome tensor)"""
+
+    __slots__ = ('alleles', 'parent_fronts', 'final_state_de')
+
+    def __init__(self, alleles):
+        self.alleles = alleles
+        self.parent_fronts = []
+        self.final_state_de = None
+
+    @staticmethod
+    def allele_type(case_study):
+        """Smallest integer type of the alleles of a case study"""
+        largest_allele = max(case_study.number_hot_streams, case_study.number_cold_streams, case_study.number_enthalpy_stages)
+        return np.int8 if largest_allele <= np.iinfo(np.int8).max else np.int16
+
+    @classmethod
+    def from_matrix(cls, exchanger_addresses, allele_type=np.int16):
+        """Genome of a copy of an exchanger address matrix"""
+        return cls(np.array(exchanger_addresses, dtype=allele_type))
+
+    def __array__(self, dtype=None):
+        """Exchanger address matrix (of integers by default) as used by the networks"""
+        return self.alleles.astype(int if dtype is None else dtype)
+
+    def __len__(self):
+        return len(self.alleles)
+
+    def __getitem__(self, index):
+        return self.alleles[index]
+
+    def __setitem__(self, index, value):
+        self.alleles[index] = value
+
+
+class CanonicalForm:
+    """Normal form of topologies: the alleles of non-existent HEX slots are zeroed and the slots of each group of
+    interchangeable slots (not existent in the initial network with identical initial data and costs) are ordered,
+    existent ones first by hot stream, cold stream and enthalpy stage. Distinct genomes of the same network share one
+    normal form, which serves as their key"""
+
+    def __init__(self, case_study):
+        initial_data = case_study.initial_exchanger_address_matrix.drop(columns='HEX')
+        groups = dict()
+        for exchanger in case_study.range_heat_exchangers:
+            if not initial_data['ex'].iloc[exchanger]:
+                groups.setdefault(tuple(initial_data.iloc[exchanger]), list()).append(exchanger)
+        self.interchangeable_groups = [np.array(group) for group in groups.values() if len(group) > 1]
+
+    def __call__(self, genomes):
+        """Bring a genome tensor (topologies, exchangers, 8) or a single genome into the normal form in place"""
+        genomes = genomes[np.newaxis] if genomes.ndim == 2 else genomes
+        genomes[genomes[..., 7] == 0, :7] = 0
+        for group in self.interchangeable_groups:
+            slots = genomes[:, group]
+            order = np.lexsort((slots[..., 2], slots[..., 1], slots[..., 0], slots[..., 7] == 0), axis=-1)
+            genomes[:, group] = np.take_along_axis(slots, order[..., np.newaxis], axis=1)
+        return genomes
+
+    def key(self, exchanger_addresses):
+        """Hashable key of the normal form of a topology (streams, enthalpy stage and existence of all HEX matches; the
+        mixer alleles are determined in the DE)"""
+        exchanger_addresses = np.array(exchanger_addresses, dtype=int)
+        return self(exchanger_addresses)[0][:, [0, 1, 2, 7]].tobytes()
@@ -0,0 +1,134 @@
+import heapq as hq
+import itertools as it
+
+import numpy as np
+from deap import creator
+
+from algorithm.lru_cache import LRUCache
+
+
+class HallOfFame:
+    """Hall of fame of the best GA individuals by their indicator, ranked ascending (the best one is last). Duplicates
+    (same canonical topology and indicator) are detected by a hash index, the records are kept in a min-heap of their
+    indicators, so that the worst one is evicted in logarithmic time; the ranking is sorted on access after a change
+    (equal indicators by their insertion). The records share the DE pareto fronts of the GA individuals instead of
+    copying them, as these fronts are not changed once evaluated"""
+
+    def __init__(self, maxsize, topology_key):
+        self.maxsize = maxsize
+        self.topology_key = topology_key
+        self.heap = list()
+        self.index = dict()
+        self.sequence = it.count()
+        self.ranking = list()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __getitem__(self, rank):
+        return self.load_record(self.ranked()[rank][3])
+
+    def __iter__(self):
+        for rank in range(len(self)):
+            yield self[rank]
+
+    @property
+    def keys(self):
+        """Indicators of the records by rank"""
+        return [entry[0] for entry in self.ranked()]
+
+    def ranked(self):
+        """Heap entries (indicator, insertion number, hash index key, record) sorted by rank"""
+        if self.ranking is None:
+            self.ranking = sorted(self.heap)
+        return self.ranking
+
+    def record_key(self, individual_ga):
+        """Hash index key of an individual: its canonical topology and indicator"""
+        return self.topology_key(individual_ga[0][2]), individual_ga.indicator.values[0]
+
+    def update(self, population_ga):
+        """Insert the individuals of a population, which are better than the worst member of the full hall of fame and
+        no duplicates of a member"""
+        for individual_ga in population_ga:
+            if self.maxsize == 0:
+                return
+            if len(self.heap) >= self.maxsize and individual_ga.indicator.values[0] <= self.heap[0][0]:
+                continue
+            record_key = self.record_key(individual_ga)
+            if record_key in self.index:
+                continue
+            if len(self.heap) >= self.maxsize:
+                self.remove_worst()
+            self.insert(individual_ga, record_key)
+
+    def insert(self, individual_ga, record_key):
+        """Insert a record of an individual"""
+        record = self.create_record(individual_ga)
+        hq.heappush(self.heap, (record_key[1], next(self.sequence), record_key, record))
+        self.index[record_key] = record
+        self.ranking = None
+
+    def remove_worst(self):
+        """Remove the record of the worst indicator (the first inserted one on ties)"""
+        _, _, record_key, record = hq.heappop(self.heap)
+        self.delete_record(record)
+        del self.index[record_key]
+        self.ranking = None
+
+    def create_record(self, individual_ga):
+        """Record of an individual, which shares its DE pareto front"""
+        record = creator.ParetoIndividual_ga(individual_ga)
+        record.indicator.values = individual_ga.indicator.values
+        return record
+
+    def load_record(self, record):
+        """GA individual of a record"""
+        return record
+
+    def delete_record(self, record):
+        """Release a removed record"""
+
+
+class SpillingHallOfFame(HallOfFame):
+    """Hall of fame of bounded memory: only the ranking keys and the compact topologies stay in memory, the heat loads
+    and objectives of the DE pareto front members of each record are spilled to a memory-mapped file. The DE pareto
+    fronts (including their networks) are rebuilt by the given function (topology, heat loads) on access, the last
+    rebuilt ones are kept in a small LRU cache"""
+
+    def __init__(self, maxsize, topology_key, path, number_members, number_heat_exchangers, number_operating_cases, number_objectives, rebuild, cache_size=4):
+        super().__init__(maxsize, topology_key)
+        self.shape = (number_heat_exchangers, number_operating_cases)
+        self.number_objectives = number_objectives
+        self.spill = np.memmap(path, dtype=float, mode='w+', shape=(max(maxsize, 1), number_members, number_heat_exchangers * number_operating_cases + number_objectives))
+        self.free_slots = list(reversed(range(maxsize)))
+        self.rebuild = rebuild
+        self.rebuilt_records = LRUCache(cache_size)
+
+    def create_record(self, individual_ga):
+        """Spill the heat loads and objectives of the DE pareto front members of an individual, returns the record (slot,
+        number of members, topology, indicator)"""
+        slot = self.free_slots.pop()
+        pareto_front_de = individual_ga[:self.spill.shape[1]]
+        for member, ind_de in enumerate(pareto_front_de):
+            self.spill[slot, member, :-self.number_objectives] = np.ravel(ind_de[0])
+            self.spill[slot, member, -self.number_objectives:] = ind_de.fitness.values
+        return slot, len(pareto_front_de), np.array(individual_ga[0][2], dtype=np.int16), individual_ga.indicator.values
+
+    def load_record(self, record):
+        """GA individual rebuilt from a spilled record"""
+        slot, number_members, exchanger_addresses, indicator = record
+        individual_ga = self.rebuilt_records.get(slot)
+        if individual_ga is None:
+            spilled = np.array(self.spill[slot, :number_members])
+            pareto_front_de = self.rebuild(exchanger_addresses.astype(int), spilled[:, :-self.number_objectives].reshape((-1,) + self.shape))
+            for ind_de, objectives in zip(pareto_front_de, spilled[:, -self.number_objectives:]):
+                ind_de.fitness.values = tuple(objectives)
+            individual_ga = creator.ParetoIndividual_ga(pareto_front_de)
+            individual_ga.indicator.values = indicator
+            self.rebuilt_records.put(slot, individual_ga)
+        return individual_ga
+
+    def delete_record(self, record):
+        self.free_slots.append(record[0])
+        self.rebuilt_records.discard(record[0])
@@ -0,0 +1,97 @@
+import warnings
+import numpy as np
+from scipy.stats import qmc
+rng = np.random.default_rng()
+
+
+class HeatLoadBounds:
+    """Lower and upper heat duty bounds of all HEX matches of a topology, built once per differential evolution run"""
+
+    def __init__(self, case_study, exchanger_addresses, minimal_heat_load, tighten=False):
+        self.hot_enthalpy_flows = np.array([stream.enthalpy_flows for stream in case_study.hot_streams])
+        self.cold_enthalpy_flows = np.array([stream.enthalpy_flows for stream in case_study.cold_streams])
+        self.hot_streams = exchanger_addresses[:, 0]
+        self.cold_streams = exchanger_addresses[:, 1]
+        self.existent = exchanger_addresses[:, 7] == 1
+        # Maximal heat duties: enthalpy flow of the weaker stream of each match
+        self.upper = np.fmin(self.hot_enthalpy_flows[self.hot_streams], self.cold_enthalpy_flows[self.cold_streams])
+        self.upper[~self.existent] = 0.0
+        self.fixed_zero = self.upper == 0
+        self.lower = np.where(self.fixed_zero, 0.0, minimal_heat_load)
+        if tighten:
+            self.tighten()
+        self.span = self.upper - self.lower
+
+    @staticmethod
+    def stack(bounds):
+        """Bounds of several topologies with shape (topologies, 1, exchangers, operating cases), which broadcast over
+        populations of shape (topologies, individuals, exchangers, operating cases)"""
+        stacked_bounds = object.__new__(HeatLoadBounds)
+        for name in ['upper', 'fixed_zero', 'lower', 'span']:
+            setattr(stacked_bounds, name, np.stack([getattr(topology_bounds, name) for topology_bounds in bounds])[:, np.newaxis])
+        return stacked_bounds
+
+    def remaining_enthalpy_flows(self, enthalpy_flows, streams):
+        """Enthalpy flow of the stream of each match which remains after all other matches on this stream in upstream,
+        parallel and downstream enthalpy stages transfer their minimal heat duty"""
+        on_same_stream = (streams[:, np.newaxis] == streams[np.newaxis, :]) & self.existent[np.newaxis, :]
+        np.fill_diagonal(on_same_stream, False)
+        minimal_heat_duties_others = np.einsum('ij,jo->io', on_same_stream, self.lower)
+        return enthalpy_flows[streams] - minimal_heat_duties_others
+
+    def tighten(self):
+        """Narrow the upper bounds to the remaining enthalpy of the hot and cold streams of each match after the minimal
+        heat duties of all other matches on them; the bound is stream-wide, as the enthalpy of a stream within an
+        enthalpy stage depends on the heat duties, so it is looser than a stage-wise bound"""
+        remaining_hot = self.remaining_enthalpy_flows(self.hot_enthalpy_flows, self.hot_streams)
+        remaining_cold = self.remaining_enthalpy_flows(self.cold_enthalpy_flows, self.cold_streams)
+        upper = np.fmin(self.upper, np.fmin(remaining_hot, remaining_cold))
+        self.upper = np.where(self.fixed_zero, 0.0, np.maximum(upper, self.lower))
+
+    def sample(self, heat_loads, design='random', generator=None):
+        """Sample heat duties within the bounds into a preallocated array of shape (..., exchangers, operating cases):
+        independent uniform random numbers or a scrambled Sobol or Latin hypercube design over the whole population (drawn
+        from the given random generator)"""
+        generator = rng if generator is None else generator
+        if design == 'random':
+            generator.random(out=heat_loads)
+        else:
+            heat_loads[:] = 0.0
+            free = ~self.fixed_zero
+            dimension = np.count_nonzero(free)
+            if dimension > 0:
+                number_individuals = int(np.prod(heat_loads.shape[:-2]))
+                heat_loads[..., free] = self.quasi_random_design(design, number_individuals, dimension, generator).reshape(heat_loads.shape[:-2] + (dimension,))
+        heat_loads *= self.span
+        heat_loads += self.lower
+
+    @staticmethod
+    def quasi_random_design(design, number_individuals, dimension, generator=None):
+        """Quasi-random points in the unit hypercube"""
+        if design == 'sobol':
+            with warnings.catch_warnings():
+                # The balance properties of Sobol' points are only exact for powers of two
+                warnings.simplefilter('ignore', UserWarning)
+                return qmc.Sobol(dimension, scramble=True, seed=rng if generator is None else generator).random(number_individuals)
+        elif design == 'lhs':
+            return qmc.LatinHypercube(dimension, seed=rng if generator is None else generator).random(number_individuals)
+        else:
+            raise ValueError('Initialization design "{0}" is invalid, choose random, sobol or lhs.'.format(design))
+
+    def snap(self, heat_loads, tolerance, round_down=False):
+        """Round heat duties in place to the grid of multiples of the tolerance, clipped to the bounds; rounded down, no
+        snapped heat duty exceeds its value before (unless raised to the lower bound), which keeps repaired energy balances"""
+        np.divide(heat_loads, tolerance, out=heat_loads)
+        if round_down:
+            np.floor(heat_loads, out=heat_loads)
+        else:
+            np.round(heat_loads, out=heat_loads)
+        heat_loads *= tolerance
+        np.clip(heat_loads, self.lower, self.upper, out=heat_loads)
+
+    def violated(self, heat_loads, out=None):
+        """Mask of heat duties outside of the bounds (fixed-zero entries are never violated)"""
+        out = np.less(heat_loads, self.lower, out=out)
+        out |= heat_loads > self.upper
+        out &= ~self.fixed_zero
+        return out
@@ -0,0 +1,95 @@
+import abc
+
+import numpy as np
+
+from algorithm.energy_balance import EnergyBalance
+from algorithm.heat_load_bounds import HeatLoadBounds
+from algorithm.local_polishing import HeatLoadObjective, LocalPolishing
+from algorithm.pareto import pareto_front, select_nsga2
+
+
+class InnerOptimizer(abc.ABC):
+    """Interface of the inner optimizers of the heat loads of a topology predefined by the genetic algorithm. optimize
+    returns the heat loads (individuals, exchangers, operating cases) and objectives (individuals, objectives) of the
+    feasible pareto front found; final_state is the state from which a later run on the same topology can be resumed
+    (None if the optimizer cannot be resumed)"""
+
+    def __init__(self):
+        self.final_state = None
+        self.final_states = list()
+        self.number_evaluations = 0
+
+    @abc.abstractmethod
+    def optimize(self, exchanger_addresses, initial_heat_loads=None, final_state=None):
+        """Optimize the heat loads of a topology (optionally starting from given heat loads, NaN entries are free)"""
+
+    def optimize_batch(self, exchanger_addresses, initial_heat_loads=None, final_states=None):
+        """Optimize the heat loads of several topologies, returns their pareto fronts; their final states are stored in
+        final_states. By default the topologies are optimized one after another"""
+        number_topologies = len(exchanger_addresses)
+        initial_heat_loads = [None] * number_topologies if initial_heat_loads is None else initial_heat_loads
+        final_states = [None] * number_topologies if final_states is None else final_states
+        results = list()
+        self.final_states = list()
+        for topology in range(number_topologies):
+            results.append(self.optimize(exchanger_addresses[topology], initial_heat_loads[topology], final_states[topology]))
+            self.final_states.append(self.final_state)
+        return results
+
+
+class MultiStartLocalSolver(InnerOptimizer):
+    """Multi-start local optimization of the heat loads: bounded local searches (scipy.optimize) from sampled start
+    points, each on a weighted sum of the reversed objectives with weights spread evenly over the starts. The pareto
+    front of all feasible evaluated points is returned"""
+
+    def __init__(self, differential_evolution, number_starts=10, maximal_evaluations=50, method='L-BFGS-B'):
+        super().__init__()
+        self.differential_evolution = differential_evolution
+        self.case_study = differential_evolution.case_study
+        self.number_starts = number_starts
+        self.maximal_evaluations = maximal_evaluations
+        self.local_polishing = LocalPolishing(differential_evolution, method, maximal_evaluations)
+        self.front_size = min(2 * differential_evolution.pareto_size, differential_evolution.population_size)
+
+    def optimize(self, exchanger_addresses, initial_heat_loads=None, final_state=None):
+        exchanger_addresses = np.array(exchanger_addresses)
+        evaluator = self.differential_evolution
+        evaluator.number_evaluations = 0
+        evaluator.history = list()
+        bounds = HeatLoadBounds(self.case_study, exchanger_addresses, evaluator.min_heat_load, evaluator.tighten_bounds)
+        energy_balance = EnergyBalance(self.case_study, exchanger_addresses)
+        starts = np.zeros([self.number_starts, self.case_study.number_heat_exchangers, self.case_study.number_operating_cases])
+        bounds.sample(starts, evaluator.initialization_design)
+        if initial_heat_loads is not None:
+            evaluator.seed_population(starts, initial_heat_loads, bounds)
+        if evaluator.repair_energy_balance:
+            energy_balance.repair(starts, bounds.lower)
+        heat_loads = list()
+        objectives = list()
+        for start, weight in zip(starts, np.linspace(0.0, 1.0, self.number_starts) if self.number_starts > 1 else [0.5]):
+            objective = HeatLoadObjective(evaluator, exchanger_addresses, bounds, energy_balance, start, self.maximal_evaluations)
+            if np.any(objective.free):
+                self.local_polishing.minimize(objective, objective.scale(start), np.array([weight, 1 - weight]))
+            else:
+                objective(objective.scale(start))
+            heat_loads.extend(objective.feasible_heat_loads)
+            objectives.extend(objective.feasible_objectives)
+            evaluator.update_history(np.array(objectives).reshape(-1, len(evaluator.objective_types)), np.ones(len(objectives), dtype=bool))
+        self.number_evaluations = evaluator.number_evaluations
+        if len(objectives) == 0:
+            return np.zeros([0, self.case_study.number_heat_exchangers, self.case_study.number_operating_cases]), np.zeros([0, len(evaluator.objective_types)])
+        heat_loads = np.array(heat_loads)
+        objectives = np.array(objectives)
+        front = pareto_front(-objectives)
+        front = front[select_nsga2(-objectives[front], self.front_size)]
+        return heat_loads[front], objectives[front]
+
+
+def create_inner_optimizer(differential_evolution, algorithm_parameter):
+    """Inner optimizer of the heat loads selected in the algorithm parameters"""
+    if algorithm_parameter.inner_optimizer == 'DE':
+        return differential_evolution
+    elif algorithm_parameter.inner_optimizer == 'multistart':
+        return MultiStartLocalSolver(differential_evolution, algorithm_parameter.multi_start_number_starts, algorithm_parameter.multi_start_number_evaluations)
+    else:
+        raise ValueError('Inner optimizer "{0}" is invalid, choose DE or multistart.'.format(algorithm_parameter.inner_optimizer))
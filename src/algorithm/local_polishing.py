@@ -0,0 +1,103 @@
+import numpy as np
+from scipy.optimize import minimize
+
+from algorithm.energy_balance import EnergyBalance
+from algorithm.heat_load_bounds import HeatLoadBounds
+
+
+class EvaluationBudgetExhausted(Exception):
+    """Raised in the objective of a local search as soon as its evaluation budget is used up"""
+
+
+class HeatLoadObjective:
+    """Reversed objectives (costs relative to the initial network) of a topology as function of its free heat loads
+    scaled to the unit interval between their bounds. Points are evaluated with the two-stage evaluation of the DE
+    within an evaluation budget, all feasible evaluated points are recorded"""
+
+    def __init__(self, differential_evolution, exchanger_addresses, bounds, energy_balance, heat_loads, maximal_evaluations):
+        self.differential_evolution = differential_evolution
+        self.exchanger_addresses = exchanger_addresses
+        self.bounds = bounds
+        self.energy_balance = energy_balance
+        self.maximal_evaluations = maximal_evaluations
+        self.free = bounds.span > 0
+        self.trial = np.array(heat_loads, dtype=float)
+        self.trial_objectives = np.zeros([1, len(differential_evolution.objective_types)])
+        self.trial_feasibility = np.zeros(1, dtype=bool)
+        self.number_evaluations = 0
+        self.last_point = None
+        self.last_reversed_objectives = None
+        self.feasible_heat_loads = list()
+        self.feasible_objectives = list()
+
+    def scale(self, heat_loads):
+        """Point in the unit hypercube of a heat load matrix"""
+        return np.clip((heat_loads[self.free] - self.bounds.lower[self.free]) / self.bounds.span[self.free], 0.0, 1.0)
+
+    def __call__(self, point):
+        if self.last_point is not None and np.array_equal(point, self.last_point):
+            return self.last_reversed_objectives
+        if self.number_evaluations >= self.maximal_evaluations:
+            raise EvaluationBudgetExhausted()
+        self.number_evaluations += 1
+        self.trial[self.free] = self.bounds.lower[self.free] + self.bounds.span[self.free] * point
+        self.differential_evolution.evaluate_population(self.exchanger_addresses, self.energy_balance, self.trial[np.newaxis], self.trial_objectives, self.trial_feasibility)
+        if self.trial_feasibility[0]:
+            self.feasible_heat_loads.append(self.trial.copy())
+            self.feasible_objectives.append(self.trial_objectives[0].copy())
+        self.last_point = np.array(point)
+        self.last_reversed_objectives = 1 / self.trial_objectives[0]
+        return self.last_reversed_objectives
+
+
+class LocalPolishing:
+    """Bounded gradient-based local optimization of the heat loads of DE pareto front members: L-BFGS-B on the weighted
+    sum or SLSQP on an epsilon-constraint scalarization of the reversed objectives relative to the polished member"""
+
+    def __init__(self, differential_evolution, method='L-BFGS-B', maximal_evaluations=100, step_size=1e-4):
+        if method not in ['L-BFGS-B', 'SLSQP']:
+            raise ValueError('Polishing method "{0}" is invalid, choose none, L-BFGS-B or SLSQP.'.format(method))
+        self.differential_evolution = differential_evolution
+        self.case_study = differential_evolution.case_study
+        self.method = method
+        self.maximal_evaluations = maximal_evaluations
+        self.step_size = step_size
+
+    @staticmethod
+    def dominates(objectives, reference_objectives):
+        """Whether objectives (to be maximized) dominate the reference objectives"""
+        return bool(np.all(np.greater_equal(objectives, reference_objectives)) and np.any(np.greater(objectives, reference_objectives)))
+
+    def minimize(self, objective, start, weights):
+        """Local search from a start point in the unit hypercube: L-BFGS-B minimizes the weighted sum of the reversed
+        objectives, SLSQP the weighted first one with the other ones bounded by their values at the start point"""
+        unit_bounds = [(0.0, 1.0)] * len(start)
+        try:
+            if self.method == 'L-BFGS-B':
+                minimize(lambda point: np.dot(weights, objective(point)), start, method='L-BFGS-B', bounds=unit_bounds,
+                         options={'eps': self.step_size, 'maxfun': objective.maximal_evaluations})
+            else:
+                epsilon = objective(start)[1:]
+                minimize(lambda point: weights[0] * objective(point)[0], start, method='SLSQP', bounds=unit_bounds,
+                         constraints=[{'type': 'ineq', 'fun': lambda point: epsilon - objective(point)[1:]}],
+                         options={'eps': self.step_size, 'maxiter': objective.maximal_evaluations})
+        except EvaluationBudgetExhausted:
+            pass
+
+    def polish(self, exchanger_addresses, heat_loads, objectives):
+        """Polish a front member; returns the heat loads and objectives of the best evaluated feasible point which
+        dominates the member or None"""
+        exchanger_addresses = np.array(exchanger_addresses)
+        bounds = HeatLoadBounds(self.case_study, exchanger_addresses, self.differential_evolution.min_heat_load, self.differential_evolution.tighten_bounds)
+        if not np.any(bounds.span > 0):
+            return None
+        energy_balance = EnergyBalance(self.case_study, exchanger_addresses)
+        objective = HeatLoadObjective(self.differential_evolution, exchanger_addresses, bounds, energy_balance, heat_loads, self.maximal_evaluations)
+        # Weights of the reversed objectives relative to the polished member
+        weights = np.array(objectives) / len(objectives)
+        self.minimize(objective, objective.scale(np.array(heat_loads, dtype=float)), weights)
+        best = None
+        for trial_heat_loads, trial_objectives in zip(objective.feasible_heat_loads, objective.feasible_objectives):
+            if self.dominates(trial_objectives, objectives) and (best is None or np.dot(weights, 1 / trial_objectives) < np.dot(weights, 1 / best[1])):
+                best = (trial_heat_loads, trial_objectives)
+        return best
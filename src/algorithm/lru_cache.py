@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded mapping which evicts the least recently used entries once more than maxsize entries (or, if given, more
+    than maxbytes bytes measured by sizeof of the values) are stored; hits, misses and evictions are counted"""
+
+    def __init__(self, maxsize, maxbytes=None, sizeof=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.items = OrderedDict()
+        self.number_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def get(self, key, default=None):
+        """Value of a key (marked as most recently used) or the default"""
+        if key not in self.items:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        """Insert or replace the value of a key and evict the least recently used entries beyond maxsize and maxbytes"""
+        if key in self.items:
+            self.number_bytes -= self.size(self.items[key])
+        self.items[key] = value
+        self.items.move_to_end(key)
+        self.number_bytes += self.size(value)
+        while len(self.items) > self.maxsize or (self.maxbytes is not None and self.number_bytes > self.maxbytes and len(self.items) > 0):
+            _, evicted = self.items.popitem(last=False)
+            self.number_bytes -= self.size(evicted)
+            self.evictions += 1
+
+    def discard(self, key):
+        """Remove a key if stored"""
+        if key in self.items:
+            self.number_bytes -= self.size(self.items.pop(key))
+
+    def size(self, value):
+        """Bytes of a value (0 without sizeof)"""
+        return 0 if self.sizeof is None else self.sizeof(value)
+
+    def clear(self):
+        self.items.clear()
+        self.number_bytes = 0
+
+    def statistics(self):
+        """Hits, misses, evictions and stored entries"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': len(self.items)}
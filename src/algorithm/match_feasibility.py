@@ -0,0 +1,43 @@
+import numpy as np
+rng = np.random.default_rng()
+
+
+class MatchFeasibilityIndex:
+    """Index of the viable HEX matches (hot stream, cold stream, enthalpy stage) of a case study: a hot stream can only
+    exchange heat with a cold stream, if its supply temperature exceeds the supply temperature of the cold stream by more
+    than dTLb in at least one operating case; utility to utility matches are excluded. The stream data does not restrict
+    the enthalpy stages, all stages of a viable pair of streams are viable"""
+
+    def __init__(self, case_study):
+        temperature_difference_lower_bound = case_study.manual_parameter['dTLb'].iloc[0]
+        hot_supply_temperatures = np.array([hot_stream.supply_temperatures for hot_stream in case_study.hot_streams])
+        cold_supply_temperatures = np.array([cold_stream.supply_temperatures for cold_stream in case_study.cold_streams])
+        self.viable_pairs = np.any(hot_supply_temperatures[:, np.newaxis] > cold_supply_temperatures[np.newaxis] + temperature_difference_lower_bound, axis=2)
+        self.viable_pairs[np.ix_(case_study.hot_utilities_indices, case_study.cold_utilities_indices)] = False
+        if not np.any(self.viable_pairs):
+            self.viable_pairs[:] = True
+        self.number_enthalpy_stages = case_study.number_enthalpy_stages
+        self.viable = np.repeat(self.viable_pairs[..., np.newaxis], case_study.number_enthalpy_stages, axis=2)
+        self.viable_matches = np.argwhere(self.viable)
+
+    def sample_matches(self, shape):
+        """Viable matches (shape, 3) drawn uniformly"""
+        return self.viable_matches[rng.integers(0, len(self.viable_matches), size=shape)]
+
+    @staticmethod
+    def sample_streams(viable, streams):
+        """Streams drawn uniformly among the viable ones (the last axis of viable); the given streams are kept where none
+        is viable"""
+        keys = np.where(viable, rng.random(viable.shape), -1.0)
+        return np.where(np.any(viable, axis=-1), np.argmax(keys, axis=-1), streams)
+
+    def resample(self, matches, added, resampled):
+        """Mutated matches (..., 3): added exchangers get a viable match, the resampled hot and cold streams of the other
+        exchangers are drawn among the ones viable with their (possibly just mutated) counterpart, resampled stages
+        uniformly"""
+        matches = np.where(added[..., np.newaxis], self.sample_matches(added.shape), matches)
+        resampled = resampled & ~added[..., np.newaxis]
+        matches[..., 0] = np.where(resampled[..., 0], self.sample_streams(self.viable_pairs.T[matches[..., 1]], matches[..., 0]), matches[..., 0])
+        matches[..., 1] = np.where(resampled[..., 1], self.sample_streams(self.viable_pairs[matches[..., 0]], matches[..., 1]), matches[..., 1])
+        matches[..., 2] = np.where(resampled[..., 2], rng.integers(0, self.number_enthalpy_stages, size=matches.shape[:-1]), matches[..., 2])
+        return matches
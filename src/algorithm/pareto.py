@@ -0,0 +1,93 @@
+import bisect as bc
+import numpy as np
+
+
+def non_dominated_ranks(objectives):
+    """Pareto front rank (0 for the non-dominated front) of each row of a (n, 2) objective array to be minimized,
+    sorted in O(n log n) by placing the points in lexicographic order on the first front they are not dominated by"""
+    ranks = np.empty(len(objectives), dtype=int)
+    last_objectives_one = list()
+    last_objectives_two = list()
+    for index in np.lexsort((objectives[:, 1], objectives[:, 0])):
+        objective_one, objective_two = objectives[index]
+        # The last point of each front has the front's lowest second objective; these are ascending over the fronts
+        rank = bc.bisect_right(last_objectives_two, objective_two)
+        if rank > 0 and last_objectives_two[rank - 1] == objective_two and last_objectives_one[rank - 1] == objective_one:
+            rank -= 1
+        if rank == len(last_objectives_two):
+            last_objectives_one.append(objective_one)
+            last_objectives_two.append(objective_two)
+        else:
+            last_objectives_one[rank] = objective_one
+            last_objectives_two[rank] = objective_two
+        ranks[index] = rank
+    return ranks
+
+
+def crowding_distances(objectives):
+    """Crowding distances of the rows of a (n, objectives) array belonging to one front (as defined in NSGA-II)"""
+    number_points, number_objectives = objectives.shape
+    distances = np.zeros(number_points)
+    if number_points == 0:
+        return distances
+    for objective in range(number_objectives):
+        order = np.argsort(objectives[:, objective], kind='stable')
+        sorted_objectives = objectives[order, objective]
+        distances[order[[0, -1]]] = np.inf
+        objective_range = sorted_objectives[-1] - sorted_objectives[0]
+        if objective_range == 0:
+            continue
+        distances[order[1:-1]] += (sorted_objectives[2:] - sorted_objectives[:-2]) / (number_objectives * objective_range)
+    return distances
+
+
+def pareto_front(objectives):
+    """Indices of the non-dominated rows of a (n, 2) objective array to be minimized"""
+    return np.flatnonzero(non_dominated_ranks(objectives) == 0)
+
+
+def select_nsga2(objectives, k):
+    """NSGA-II selection of k rows of a (n, 2) objective array to be minimized: whole fronts by rank, the last front
+    which does not fit completely by descending crowding distance. Returns the selected indices"""
+    ranks = non_dominated_ranks(objectives)
+    k = min(k, len(objectives))
+    if k == 0:
+        return np.zeros(0, dtype=int)
+    front_sizes = np.bincount(ranks)
+    last_rank = np.searchsorted(np.cumsum(front_sizes), k)
+    selected = np.flatnonzero(ranks < last_rank)
+    last_front = np.flatnonzero(ranks == last_rank)
+    if len(selected) + len(last_front) > k:
+        crowding = crowding_distances(objectives[last_front])
+        last_front = last_front[np.argsort(-crowding, kind='stable')[:k - len(selected)]]
+    return np.concatenate((selected, last_front))
+
+
+def hypervolumes_2d(objectives, fronts, reference_point, number_fronts=None):
+    """Hypervolumes of several fronts of a (n, 2) objective array to be minimized, fronts gives the index of the front
+    of each row. The dominated area of each front up to the reference point is accumulated as rectangles of its
+    staircase in lexicographic order, in O(n log n) for all fronts together; rows not strictly dominating the reference
+    point are ignored"""
+    objectives = np.asarray(objectives, dtype=float).reshape(-1, 2)
+    fronts = np.asarray(fronts, dtype=int)
+    number_fronts = (np.max(fronts) + 1 if len(fronts) > 0 else 0) if number_fronts is None else number_fronts
+    relevant = np.all(objectives < reference_point, axis=1)
+    objectives, fronts = objectives[relevant], fronts[relevant]
+    if len(objectives) == 0:
+        return np.zeros(number_fronts)
+    order = np.lexsort((objectives[:, 1], objectives[:, 0], fronts))
+    objectives, fronts = objectives[order], fronts[order]
+    # Running minimum of the second objective within each front on integer ranks, offset so that fronts do not interact
+    sorted_objectives_two = np.sort(objectives[:, 1])
+    offsets = fronts.astype(np.int64) * len(objectives)
+    ranks = np.searchsorted(sorted_objectives_two, objectives[:, 1]) - offsets
+    minimal_objectives_two = sorted_objectives_two[np.minimum.accumulate(ranks) + offsets]
+    next_objectives_one = np.append(objectives[1:, 0], reference_point[0])
+    next_objectives_one[np.append(fronts[1:] != fronts[:-1], True)] = reference_point[0]
+    areas = (next_objectives_one - objectives[:, 0]) * (reference_point[1] - minimal_objectives_two)
+    return np.bincount(fronts, weights=areas, minlength=number_fronts)
+
+
+def hypervolume_2d(objectives, reference_point):
+    """Hypervolume of a (n, 2) objective array to be minimized up to the reference point"""
+    return hypervolumes_2d(objectives, np.zeros(len(objectives), dtype=int), reference_point, 1)[0]
@@ -0,0 +1,79 @@
+import hashlib
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class TopologyStore:
+    """Persistent SQLite store of the DE pareto fronts (heat loads and objectives of the feasible members) of topologies,
+    keyed by a content hash of the case study (and the objectives) and the canonical topology key. The store is shared by
+    runs and worker processes (write-ahead log, writes wait for locks of other processes); beyond maxsize topologies the
+    least recently used ones are evicted"""
+
+    def __init__(self, path, case_study, objective_types, maxsize=10000, timeout=60.0):
+        self.path = path
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.shape = (case_study.number_heat_exchangers, case_study.number_operating_cases)
+        self.number_objectives = len(objective_types)
+        self.case_study_hash = self.content_hash(case_study, objective_types)
+        self.connection = None
+        with self.connect() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS fronts (case_study TEXT, topology BLOB, heat_loads BLOB, objectives BLOB, '
+                               'last_access REAL, PRIMARY KEY (case_study, topology))')
+            connection.execute('CREATE INDEX IF NOT EXISTS fronts_last_access ON fronts (last_access)')
+
+    def __getstate__(self):
+        """Connections are not sent to the workers, each process opens its own one"""
+        state = self.__dict__.copy()
+        state['connection'] = None
+        return state
+
+    @staticmethod
+    def content_hash(case_study, objective_types):
+        """Hash of the content of all sheets of a case study and the objectives"""
+        content_hash = hashlib.sha256()
+        for sheet in [case_study.initial_exchanger_address_matrix, case_study.initial_exchanger_balance_utilities,
+                      case_study.initial_utility_balance_heat_loads, case_study.stream_data, case_study.match_cost,
+                      case_study.economic_data, case_study.manual_parameter]:
+            content_hash.update(str(list(sheet.columns)).encode())
+            content_hash.update(pd.util.hash_pandas_object(sheet, index=True).values.tobytes())
+        content_hash.update(str(list(objective_types)).encode())
+        return content_hash.hexdigest()
+
+    def connect(self):
+        """Connection of this process to the store"""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=self.timeout)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+        return self.connection
+
+    def get(self, topology_key):
+        """Heat loads (members, exchangers, operating cases) and objectives (members, objectives) of a stored topology or
+        None"""
+        with self.connect() as connection:
+            row = connection.execute('SELECT heat_loads, objectives FROM fronts WHERE case_study = ? AND topology = ?',
+                                     (self.case_study_hash, topology_key)).fetchone()
+            if row is None:
+                return None
+            connection.execute('UPDATE fronts SET last_access = ? WHERE case_study = ? AND topology = ?',
+                               (time.time(), self.case_study_hash, topology_key))
+        heat_loads = np.frombuffer(row[0], dtype=float).reshape((-1,) + self.shape)
+        objectives = np.frombuffer(row[1], dtype=float).reshape(-1, self.number_objectives)
+        return heat_loads, objectives
+
+    def put(self, topology_key, heat_loads, objectives):
+        """Store the front of a topology and evict the least recently used topologies beyond maxsize"""
+        with self.connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO fronts VALUES (?, ?, ?, ?, ?)',
+                               (self.case_study_hash, topology_key, np.asarray(heat_loads, dtype=float).tobytes(),
+                                np.asarray(objectives, dtype=float).tobytes(), time.time()))
+            number_evicted = connection.execute('SELECT COUNT(*) FROM fronts').fetchone()[0] - self.maxsize
+            if number_evicted > 0:
+                connection.execute('DELETE FROM fronts WHERE rowid IN (SELECT rowid FROM fronts ORDER BY last_access LIMIT ?)', (number_evicted,))
+
+    def __len__(self):
+        with self.connect() as connection:
+            return connection.execute('SELECT COUNT(*) FROM fronts WHERE case_study = ?', (self.case_study_hash,)).fetchone()[0]
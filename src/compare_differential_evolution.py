@@ -0,0 +1,83 @@
+import os
+import sys
+import numpy as np
+from deap import base
+from deap import creator
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from algorithm.differential_evolution import DifferentialEvolution
+
+CASE_STUDIES = ['JonesP3.xlsx', 'Zweifel.xlsx']
+VARIANTS = ['classic', 'jDE', 'SHADE']
+TARGET_FRACTION = 0.95
+
+
+def run_variant(case_study, algorithm_parameter, variant, number_runs):
+    """Run the DE variant repeatedly on the initial topology of the case study and return the recorded histories"""
+    algorithm_parameter.differential_evolution_variant = variant
+    differential_evolution = DifferentialEvolution(case_study, algorithm_parameter)
+    differential_evolution.record_history = True
+    exchanger_addresses = differential_evolution.heat_exchanger_network.exchanger_addresses.matrix
+    histories = list()
+    for _ in range(number_runs):
+        differential_evolution.differential_evolution(exchanger_addresses.copy())
+        histories.append(differential_evolution.history)
+    return histories
+
+
+def hypervolume_trace(history, reference_point):
+    """Number of evaluations and hypervolume of the feasible individuals after each DE generation"""
+    evaluations = np.array([number_evaluations for number_evaluations, _ in history])
+    hypervolumes = np.zeros(len(history))
+    for generation, (_, objectives) in enumerate(history):
+        if len(objectives) > 0:
+            hypervolumes[generation] = DifferentialEvolution.front_hypervolume(objectives, np.ones(len(objectives), dtype=bool), reference_point)[0]
+    return evaluations, hypervolumes
+
+
+def evaluations_to_target(evaluations, hypervolumes, target):
+    """Number of evaluations until the hypervolume reaches the target (NaN if never reached)"""
+    reached = np.flatnonzero(hypervolumes >= target)
+    if len(reached) == 0:
+        return np.nan
+    return evaluations[reached[0]]
+
+
+def compare_variants(case_study, algorithm_parameter, number_runs):
+    """Evaluations-to-target-hypervolume of all DE variants on one case study. The reference point and the target are
+    common to all variants: twice the worst and a fraction of the best result of all runs"""
+    histories = {variant: run_variant(case_study, algorithm_parameter, variant, number_runs) for variant in VARIANTS}
+    all_objectives = [objectives for variant in VARIANTS for history in histories[variant] for _, objectives in history if len(objectives) > 0]
+    if len(all_objectives) == 0:
+        print('%s: no feasible solutions found' % case_study.name)
+        return
+    reference_point = 2 * np.max(1 / np.concatenate(all_objectives), axis=0)
+    traces = {variant: [hypervolume_trace(history, reference_point) for history in histories[variant]] for variant in VARIANTS}
+    target = TARGET_FRACTION * max(np.max(hypervolumes) for variant in VARIANTS for _, hypervolumes in traces[variant])
+    print('%s (target hypervolume %.4f):' % (case_study.name, target))
+    for variant in VARIANTS:
+        evaluations = np.array([evaluations_to_target(evaluations, hypervolumes, target) for evaluations, hypervolumes in traces[variant]])
+        final_hypervolumes = np.array([hypervolumes[-1] for _, hypervolumes in traces[variant]])
+        reached = ~np.isnan(evaluations)
+        print('  %-8s reached target: %i/%i, evaluations to target (mean): %s, final hypervolume (mean): %.4f' % (
+            variant, np.count_nonzero(reached), number_runs, '%.0f' % np.mean(evaluations[reached]) if any(reached) else '-', np.mean(final_hypervolumes)))
+
+
+def main():
+    """Comparison mode of the DE variants on the bundled case studies:
+    python compare_differential_evolution.py [algorithm parameter file] [number of runs]"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    name_algorithm_parameter = sys.argv[1] if len(sys.argv) > 1 else 'AlgorithmParameter.xlsx'
+    number_runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    creator.create('FitnessMin_de', base.Fitness, weights=(1.0, 1.0))
+    creator.create('Individual_de', list, fitness=creator.FitnessMin_de)
+    for name_case_study in CASE_STUDIES:
+        case_study = CaseStudy(name_case_study)
+        algorithm_parameter = AlgorithmParameter(name_algorithm_parameter)
+        compare_variants(case_study, algorithm_parameter, number_runs)
+
+
+if __name__ == "__main__":
+    main()
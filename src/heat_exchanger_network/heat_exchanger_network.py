@@ -317,6 +317,26 @@ class HeatExchangerNetwork:
                 utility_connections += 1
         return utility_connections
 
+    def split_heat_exchanger_violation_distances(self, exchanger_addresses):
+        """Split violation distances of a stack of exchanger address matrices (topologies, exchangers, 8)"""
+        exchanger_addresses = np.asarray(exchanger_addresses, dtype=int)
+        topologies = np.arange(len(exchanger_addresses))[:, np.newaxis]
+        existent = (exchanger_addresses[..., 7] != 0).astype(int)
+        number_split_violations = np.zeros(len(exchanger_addresses), dtype=int)
+        for stream_allele, number_streams, utilities_indices in [(0, self.number_hot_streams, self.hot_utilities_indices),
+                                                                 (1, self.number_cold_streams, self.cold_utilities_indices)]:
+            dubs = np.zeros([len(exchanger_addresses), self.number_enthalpy_stages, number_streams], dtype=int)
+            np.add.at(dubs, (topologies, exchanger_addresses[..., 2], exchanger_addresses[..., stream_allele]), existent)
+            dubs[..., utilities_indices] = 0
+            number_split_violations += np.sum(np.maximum(dubs - (self.max_splits + 1), 0), axis=(1, 2))
+        return number_split_violations
+
+    def utility_connections_violation_distances(self, exchanger_addresses):
+        """Utility connection violation distances of a stack of exchanger address matrices (topologies, exchangers, 8)"""
+        exchanger_addresses = np.asarray(exchanger_addresses, dtype=int)
+        utility_connections = np.isin(exchanger_addresses[..., 0], self.hot_utilities_indices) & np.isin(exchanger_addresses[..., 1], self.cold_utilities_indices)
+        return np.sum(utility_connections, axis=1)
+
     def topology_violation_distance(self, exchanger_addresses):
         return self.split_heat_exchanger_violation_distance(exchanger_addresses) + self.utility_connections_violation_distance(exchanger_addresses)
 
@@ -19,7 +19,7 @@ def main():
     genetic_algorithm = GeneticAlgorithm(case_study, algorithm_parameter)
     hall_of_fame = genetic_algorithm.genetic_algorithm()
     file = open("HallOfFame.pkl", "wb")
-    pickle.dump([[[hall_of_fame[z][y][x] for x in range(len(hall_of_fame[z][y]))] for y in range(len(hall_of_fame[z]))] for z in range(len(hall_of_fame.items))], file)
+    pickle.dump([[[hall_of_fame[z][y][x] for x in range(len(hall_of_fame[z][y]))] for y in range(len(hall_of_fame[z]))] for z in range(len(hall_of_fame))], file)
     file.close()
     print(210*"-")
     print("\nMulti-objective optimization is finished. Do you want to access the results? Input yes/no?\n")
@@ -24,6 +24,33 @@ class AlgorithmParameter:
         self.differential_evolution_perturbation_factor = None
         self.differential_evolution_probability_crossover = None
         self.differential_evolution_number_no_improvement = None
+        self.differential_evolution_tighten_bounds = None
+        self.differential_evolution_repair_energy_balance = None
+        self.differential_evolution_hypervolume_tolerance = None
+        self.differential_evolution_hypervolume_window = None
+        self.differential_evolution_variant = None
+        self.differential_evolution_initialization = None
+        self.differential_evolution_warm_start_fraction = None
+        self.differential_evolution_resume_generations = None
+        self.differential_evolution_resume_cache_size = None
+        self.differential_evolution_refine_survivors = None
+        self.differential_evolution_polishing = None
+        self.differential_evolution_polishing_evaluations = None
+        self.genetic_algorithm_polishing_elite_size = None
+        self.differential_evolution_snap_heat_loads = None
+        self.differential_evolution_memo_size = None
+        self.differential_evolution_batch_size = None
+        self.genetic_algorithm_cache_size = None
+        self.genetic_algorithm_cache_memory = None
+        self.genetic_algorithm_store = None
+        self.genetic_algorithm_store_size = None
+        self.genetic_algorithm_reference_point = None
+        self.genetic_algorithm_reference_factor = None
+        self.genetic_algorithm_hall_of_fame_file = None
+        self.genetic_algorithm_match_index = None
+        self.inner_optimizer = None
+        self.multi_start_number_starts = None
+        self.multi_start_number_evaluations = None
         self.objectives_types = None
         self.read_parameter()
 
@@ -47,6 +74,41 @@ class AlgorithmParameter:
         self.differential_evolution_perturbation_factor = algorithm_parameter['PerturbationDE'].iloc[0]
         self.differential_evolution_probability_crossover = algorithm_parameter['CrossProbDE'].iloc[0]
         self.differential_evolution_number_no_improvement = int(algorithm_parameter['NumNoImprovDE'].iloc[0])
+        self.differential_evolution_tighten_bounds = bool(self.read_optional_parameter(algorithm_parameter, 'TightenBoundsDE', False))
+        self.differential_evolution_repair_energy_balance = bool(self.read_optional_parameter(algorithm_parameter, 'RepairDE', False))
+        self.differential_evolution_hypervolume_tolerance = float(self.read_optional_parameter(algorithm_parameter, 'HVTolDE', 0.0))
+        self.differential_evolution_hypervolume_window = int(self.read_optional_parameter(algorithm_parameter, 'HVWindowDE', 5))
+        self.differential_evolution_variant = str(self.read_optional_parameter(algorithm_parameter, 'VariantDE', 'classic'))
+        self.differential_evolution_initialization = str(self.read_optional_parameter(algorithm_parameter, 'InitDE', 'random'))
+        self.differential_evolution_warm_start_fraction = float(self.read_optional_parameter(algorithm_parameter, 'WarmStartDE', 0.0))
+        self.differential_evolution_resume_generations = int(self.read_optional_parameter(algorithm_parameter, 'ResumeGenDE', 0))
+        self.differential_evolution_resume_cache_size = int(self.read_optional_parameter(algorithm_parameter, 'ResumeCacheDE', 100))
+        self.differential_evolution_refine_survivors = bool(self.read_optional_parameter(algorithm_parameter, 'RefineDE', False))
+        self.differential_evolution_polishing = str(self.read_optional_parameter(algorithm_parameter, 'PolishDE', 'none'))
+        self.differential_evolution_polishing_evaluations = int(self.read_optional_parameter(algorithm_parameter, 'PolishEvalDE', 100))
+        self.genetic_algorithm_polishing_elite_size = int(self.read_optional_parameter(algorithm_parameter, 'PolishEliteGA', 1))
+        self.differential_evolution_snap_heat_loads = bool(self.read_optional_parameter(algorithm_parameter, 'SnapDE', False))
+        self.differential_evolution_memo_size = int(self.read_optional_parameter(algorithm_parameter, 'MemoDE', 0))
+        self.differential_evolution_batch_size = int(self.read_optional_parameter(algorithm_parameter, 'BatchDE', 1))
+        self.genetic_algorithm_cache_size = int(self.read_optional_parameter(algorithm_parameter, 'CacheGA', 0))
+        self.genetic_algorithm_cache_memory = float(self.read_optional_parameter(algorithm_parameter, 'CacheMemoryGA', 0.0))
+        self.genetic_algorithm_store = str(self.read_optional_parameter(algorithm_parameter, 'StoreGA', 'none'))
+        self.genetic_algorithm_store_size = int(self.read_optional_parameter(algorithm_parameter, 'StoreSizeGA', 10000))
+        self.genetic_algorithm_reference_point = str(self.read_optional_parameter(algorithm_parameter, 'ReferenceGA', 'population'))
+        self.genetic_algorithm_reference_factor = float(self.read_optional_parameter(algorithm_parameter, 'ReferenceFactorGA', 2.0))
+        self.genetic_algorithm_hall_of_fame_file = str(self.read_optional_parameter(algorithm_parameter, 'HoFFileGA', 'none'))
+        self.genetic_algorithm_match_index = bool(self.read_optional_parameter(algorithm_parameter, 'MatchIndexGA', False))
+        # Inner optimizer of the heat loads
+        self.inner_optimizer = str(self.read_optional_parameter(algorithm_parameter, 'InnerOptimizer', 'DE'))
+        self.multi_start_number_starts = int(self.read_optional_parameter(algorithm_parameter, 'StartsMS', 10))
+        self.multi_start_number_evaluations = int(self.read_optional_parameter(algorithm_parameter, 'EvalMS', 50))
         # Objectives
         self.objective_types = [algorithm_parameter['OFs'][0],algorithm_parameter['OFs'][1]]
         os.chdir('..')
+
+    @staticmethod
+    def read_optional_parameter(algorithm_parameter, name, default):
+        """Read an optional parameter, parameter files without this column (or with an empty cell) use the default"""
+        if name in algorithm_parameter.columns and not pd.isna(algorithm_parameter[name].iloc[0]):
+            return algorithm_parameter[name].iloc[0]
+        return default
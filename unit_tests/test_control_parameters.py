@@ -0,0 +1,49 @@
+import os
+import sys
+import platform
+import numpy as np
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from algorithm.control_parameters import JDEControlParameters
+from algorithm.control_parameters import SHADEControlParameters
+
+
+def test_parameter_ranges():
+    """Adaptive variants keep F in (0, 1] and CR in [0, 1] over many generations"""
+    for control_parameters in [JDEControlParameters(0.5, 0.9, np.random.default_rng(1), 0.5, 0.5),
+                               SHADEControlParameters(0.5, 0.9, np.random.default_rng(1))]:
+        parents = np.zeros([1000, 2])
+        control_parameters.initialize(parents)
+        for _ in range(20):
+            trials = np.zeros([1000, 2])
+            control_parameters.generate(parents, trials)
+            assert np.all(trials[:, 0] > 0) and np.all(trials[:, 0] <= 1)
+            assert np.all(trials[:, 1] >= 0) and np.all(trials[:, 1] <= 1)
+            parents = trials
+
+
+def test_shade_memory():
+    """The SHADE memory moves toward the parameters of improving trials, trials without gain do not pull it"""
+    control_parameters = SHADEControlParameters(0.5, 0.5, np.random.default_rng(1), memory_size=2)
+    parameters = np.zeros([3, 2])
+    control_parameters.initialize(parameters)
+    trials = np.array([[0.9, 0.8], [0.2, 0.1], [0.3, 0.2]])
+    successful = np.array([True, True, False])
+    improvements = np.array([1.0, -2.0, 5.0])
+    control_parameters.update(trials, successful, improvements)
+    assert np.allclose(control_parameters.memory[0], [0.9, 0.8])
+    assert np.allclose(control_parameters.memory[1], [0.5, 0.5])
+    assert control_parameters.memory_index == 1
+    # Without any gain the successful trials are weighted equally
+    control_parameters.update(trials, successful, np.zeros(3))
+    assert np.allclose(control_parameters.memory[1], [(0.81 + 0.04) / 1.1, 0.45])
+    assert control_parameters.memory_index == 0
+    # No successful trial leaves the memory unchanged
+    memory = control_parameters.memory.copy()
+    control_parameters.update(trials, np.zeros(3, dtype=bool), improvements)
+    assert np.array_equal(control_parameters.memory, memory) and control_parameters.memory_index == 0
@@ -0,0 +1,240 @@
+import os
+import sys
+import pickle
+from collections import deque
+import platform
+import numpy as np
+import pytest
+from deap import base
+from deap import creator
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from heat_exchanger_network.exchanger_addresses import ExchangerAddresses
+from algorithm.heat_load_bounds import HeatLoadBounds
+from algorithm.energy_balance import EnergyBalance
+from heat_exchanger_network.heat_exchanger.operation_parameter import OperationParameter
+from algorithm.control_parameters import create_control_parameters
+import algorithm.differential_evolution
+from algorithm.differential_evolution import DifferentialEvolution, DifferentialEvolutionRun
+from algorithm.genome import Genome
+from algorithm.genetic_algorithm import GeneticAlgorithm
+
+
+def setup_model(**parameters):
+    """Setup the differential evolution of JonesP3 with changed algorithm parameters"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    for name, value in parameters.items():
+        setattr(algorithm_parameter, name, value)
+    if not hasattr(creator, 'Individual_de'):
+        creator.create('FitnessMin_de', base.Fitness, weights=(1.0, 1.0))
+        creator.create('Individual_de', list, fitness=creator.FitnessMin_de)
+    return test_case, algorithm_parameter, DifferentialEvolution(test_case, algorithm_parameter)
+
+
+def test_resume_shade():
+    test_case, algorithm_parameter, differential_evolution = setup_model(differential_evolution_variant='SHADE', differential_evolution_number_generations=3,
+                                                                         differential_evolution_resume_generations=2)
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    differential_evolution.optimize(exchanger_addresses)
+    final_state = differential_evolution.final_state
+    memory, memory_index = final_state[4]
+    assert np.all(memory > 0)
+    run = DifferentialEvolutionRun(exchanger_addresses, HeatLoadBounds(test_case, exchanger_addresses, differential_evolution.min_heat_load), EnergyBalance(test_case, exchanger_addresses),
+                                   create_control_parameters(algorithm_parameter), 1)
+    differential_evolution.allocate_buffers(1)
+    differential_evolution.initialize_run(run, 0, 0, final_state=final_state)
+    assert np.array_equal(run.control_parameters.memory, memory) and run.control_parameters.memory is not memory
+    assert run.control_parameters.memory_index == memory_index
+    differential_evolution.optimize(exchanger_addresses, final_state=final_state)
+    assert np.all(differential_evolution.final_state[4][0][:, 0] > 0)
+
+
+def test_snap_after_repair():
+    test_case, _, differential_evolution = setup_model()
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    bounds = HeatLoadBounds(test_case, exchanger_addresses, differential_evolution.min_heat_load)
+    energy_balance = EnergyBalance(test_case, exchanger_addresses)
+    heat_loads = np.zeros([50, test_case.number_heat_exchangers, test_case.number_operating_cases])
+    bounds.sample(heat_loads, 'random')
+    heat_loads *= 3
+    assert np.any(energy_balance.violation_distances(heat_loads) > 0)
+    energy_balance.repair(heat_loads, bounds.lower)
+    repaired = heat_loads.copy()
+    tolerance = differential_evolution.absolute_heat_load_tolerance
+    bounds.snap(heat_loads, tolerance, round_down=True)
+    assert np.all((heat_loads <= repaired) | (heat_loads == bounds.lower))
+    assert np.allclose(energy_balance.violation_distances(heat_loads), 0.0)
+    on_grid = np.isclose(heat_loads / tolerance, np.round(heat_loads / tolerance))
+    assert np.all(on_grid | (heat_loads == bounds.lower) | (heat_loads == bounds.upper))
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError, match='DE variant'):
+        setup_model(differential_evolution_variant='LSHADE')
+    with pytest.raises(ValueError, match='Initialization design'):
+        setup_model(differential_evolution_initialization='halton')
+
+
+def optimize_separately(differential_evolution, topologies, seed, final_states):
+    """Fronts, final states and number of evaluations of topologies optimized one after another"""
+    algorithm.differential_evolution.rng = np.random.default_rng(seed)
+    results, number_evaluations = list(), 0
+    for exchanger_addresses, final_state in zip(topologies, final_states):
+        results.append(differential_evolution.optimize(exchanger_addresses, final_state=final_state))
+        number_evaluations += differential_evolution.number_evaluations
+    return results, number_evaluations
+
+
+def check_batch(differential_evolution, topologies, final_states, monkeypatch):
+    """A lockstep batch finds the same fronts and final states with the same seed as separate runs and evaluates only the
+    running topologies"""
+    # Mixers of streams of equal heat capacity flows are chosen at random in each network calculation
+    monkeypatch.setattr(OperationParameter, 'random_choice', lambda self, array, seed=None: array[0])
+    monkeypatch.setattr(algorithm.differential_evolution, 'rng', np.random.default_rng(11))
+    results_batch = differential_evolution.optimize_batch(topologies, None, final_states)
+    final_states_batch = differential_evolution.final_states
+    number_evaluations = differential_evolution.number_evaluations
+    results, number_evaluations_separate = optimize_separately(differential_evolution, topologies, 11, final_states)
+    for result_batch, result in zip(results_batch, results):
+        assert np.array_equal(result_batch[0], result[0]) and np.array_equal(result_batch[1], result[1])
+    assert np.array_equal(final_states_batch[-1][0], differential_evolution.final_state[0])
+    assert number_evaluations == number_evaluations_separate
+
+
+def test_batch(monkeypatch):
+    test_case, _, differential_evolution = setup_model(differential_evolution_variant='SHADE', differential_evolution_number_generations=4)
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    other_addresses = exchanger_addresses.copy()
+    other_addresses[0, 7] = 0
+    check_batch(differential_evolution, [exchanger_addresses, other_addresses], [None, None], monkeypatch)
+
+
+def test_batch_termination(monkeypatch):
+    test_case, _, differential_evolution = setup_model(differential_evolution_variant='jDE', differential_evolution_number_generations=6,
+                                                       differential_evolution_resume_generations=1)
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    other_addresses = exchanger_addresses.copy()
+    other_addresses[0, 7] = 0
+    differential_evolution.optimize(other_addresses)
+    # The resumed topology stops after one generation, the other one runs on
+    check_batch(differential_evolution, [exchanger_addresses, other_addresses], [None, differential_evolution.final_state], monkeypatch)
+    differential_evolution.number_no_improvement = 0
+    check_batch(differential_evolution, [other_addresses, exchanger_addresses, other_addresses], [None, None, None], monkeypatch)
+
+
+def test_evaluation_memo(monkeypatch):
+    test_case, algorithm_parameter, differential_evolution = setup_model(differential_evolution_memo_size=1000)
+    # Copies of the DE sent to a worker process share the memo of the process
+    assert pickle.loads(pickle.dumps(differential_evolution)).evaluation_memo is differential_evolution.evaluation_memo
+    differential_evolution.evaluation_memo.clear()
+    monkeypatch.setattr(OperationParameter, 'random_choice', lambda self, array, seed=None: array[0])
+    genetic_algorithm = GeneticAlgorithm(test_case, algorithm_parameter)
+    genetic_algorithm.pseudo_pareto_front_de = genetic_algorithm.initialize_pseudo_pareto_front_de(base.Toolbox())
+    individual = Genome.from_matrix(ExchangerAddresses(test_case).matrix, genetic_algorithm.allele_type)
+    results = list()
+    for _ in range(2):
+        monkeypatch.setattr(algorithm.differential_evolution, 'rng', np.random.default_rng(4))
+        results.append(genetic_algorithm.evaluate_topology(individual))
+    # The repeated run draws the same heat loads, all its evaluations on the network are taken from the memo
+    assert results[1][2] > results[0][2] and results[1][2] == len(genetic_algorithm.differential_evolution.evaluation_memo.items) + results[0][2]
+    assert [ind_de.fitness.values for ind_de in results[0][0]] == [ind_de.fitness.values for ind_de in results[1][0]]
+    monkeypatch.setattr(algorithm.differential_evolution, 'rng', np.random.default_rng(4))
+    genetic_algorithm.evaluate_individuals([individual])
+    assert genetic_algorithm.number_memo_hits == results[1][2]
+
+
+def test_is_converged():
+    _, _, differential_evolution = setup_model(differential_evolution_hypervolume_tolerance=0.01, differential_evolution_hypervolume_window=3)
+    hypervolumes = deque(maxlen=4)
+    for hypervolume in [1.0, 1.001, 1.002]:
+        hypervolumes.append(hypervolume)
+        # Fewer than HVWindowDE generations since the first hypervolume
+        assert not differential_evolution.is_converged(hypervolumes)
+    hypervolumes.append(1.005)
+    assert differential_evolution.is_converged(hypervolumes)
+    # Still improving: the window slides on, the change over it exceeds the tolerance
+    for hypervolume in [1.02, 1.04, 1.06, 1.08]:
+        hypervolumes.append(hypervolume)
+        assert not differential_evolution.is_converged(hypervolumes)
+    # Stagnation is detected once the whole window lies within the tolerance
+    for hypervolume, converged in zip([1.081, 1.082, 1.083], [False, False, True]):
+        hypervolumes.append(hypervolume)
+        assert differential_evolution.is_converged(hypervolumes) == converged
+    assert not differential_evolution.is_converged(deque([0.0, 0.0, 0.0, 0.0], maxlen=4))
+    differential_evolution.hypervolume_tolerance = 0.0
+    assert not differential_evolution.is_converged(deque([1.0, 1.0, 1.0, 1.0], maxlen=4))
+
+
+def setup_selection(differential_evolution, test_case, algorithm_parameter, objectives):
+    """Run of four individuals, whose parents and trials of the given objectives of shape (halves, individuals,
+    objectives) are tagged with their half and row in their heat loads and control parameters"""
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    run = DifferentialEvolutionRun(exchanger_addresses, HeatLoadBounds(test_case, exchanger_addresses, differential_evolution.min_heat_load), EnergyBalance(test_case, exchanger_addresses),
+                                   create_control_parameters(algorithm_parameter), 1)
+    run.number_individuals = 4
+    differential_evolution.allocate_buffers(1)
+    tags = 10 * np.arange(2)[:, np.newaxis] + np.arange(4)
+    differential_evolution.heat_loads_pools[0, :, 0, :4] = tags[:, :, np.newaxis, np.newaxis]
+    differential_evolution.control_parameter_pools[0, :, 0, :4] = tags[:, :, np.newaxis] / 100
+    differential_evolution.objectives_pools[0, :, 0, :4] = objectives
+    differential_evolution.feasibility_pools[0, :, 0, :4] = True
+    return run
+
+
+def test_select_population_keeps_parents():
+    test_case, algorithm_parameter, differential_evolution = setup_model()
+    parents = np.array([[4.0, 1.0], [3.0, 2.0], [2.0, 3.0], [1.0, 4.0]])
+    run = setup_selection(differential_evolution, test_case, algorithm_parameter, np.stack((parents, parents - 0.5)))
+    run.number_without_improvement = 2
+    differential_evolution.select_population(run, 0, 0, 1, 4)
+    assert run.number_individuals == 4 and run.number_without_improvement == 6
+    selected = np.sort(differential_evolution.heat_loads_pools[1, 0, 0, :4, 0, 0])
+    assert np.array_equal(selected, np.arange(4))
+
+
+def test_select_population_rows():
+    test_case, algorithm_parameter, differential_evolution = setup_model()
+    parents = np.array([[4.0, 1.0], [3.0, 2.0], [2.0, 3.0], [1.0, 4.0]])
+    # Trial 0 and 2 dominate their parents, trial 1 is incomparable to its parent, trial 3 is dominated
+    trials = np.array([[5.0, 2.0], [3.5, 1.5], [3.0, 4.0], [0.5, 3.5]])
+    run = setup_selection(differential_evolution, test_case, algorithm_parameter, np.stack((parents, trials)))
+    differential_evolution.select_population(run, 0, 0, 1, 4)
+    assert run.number_individuals == 4 and run.number_without_improvement == 1
+    tags = differential_evolution.heat_loads_pools[1, 0, 0, :4, 0, 0].astype(int)
+    assert 0 not in tags and 2 not in tags and 13 not in tags
+    assert np.array_equal(differential_evolution.control_parameter_pools[1, 0, 0, :4], np.repeat(tags[:, np.newaxis] / 100, 2, axis=1))
+    candidates = np.stack((parents, trials))
+    assert np.array_equal(differential_evolution.objectives_pools[1, 0, 0, :4], candidates[tags // 10, tags % 10])
+
+
+def test_prescreen_penalty():
+    test_case, _, differential_evolution = setup_model()
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    bounds = HeatLoadBounds(test_case, exchanger_addresses, differential_evolution.min_heat_load)
+    energy_balance = EnergyBalance(test_case, exchanger_addresses)
+    heat_loads = np.zeros([20, test_case.number_heat_exchangers, test_case.number_operating_cases])
+    bounds.sample(heat_loads, 'random', np.random.default_rng(2))
+    heat_loads *= 3
+    violated = np.flatnonzero(energy_balance.violation_distances(heat_loads) > 0)
+    assert len(violated) > 0
+    objectives = np.zeros([len(heat_loads), 2])
+    differential_evolution.evaluate_population(exchanger_addresses, energy_balance, heat_loads, objectives, np.zeros(len(heat_loads), dtype=bool))
+    # The prescreen penalty equals the full penalty without the temperature difference and mixer terms
+    for individual in violated:
+        objectives_network = np.zeros(2)
+        assert not differential_evolution.evaluate_heat_loads(exchanger_addresses, heat_loads[individual], objectives_network)
+        network = differential_evolution.evaluation_network
+        quadratic_distance = test_case.number_heat_exchangers * network.infeasibility_energy_balance[1]
+        assert np.allclose(objectives[individual], 1 / (4 + quadratic_distance), rtol=1e-6)
+        assert np.all(objectives[individual] >= objectives_network)
@@ -0,0 +1,51 @@
+import os
+import sys
+import platform
+import numpy as np
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from heat_exchanger_network.heat_exchanger_network import HeatExchangerNetwork
+from algorithm.energy_balance import EnergyBalance
+
+
+def setup_model():
+    """Setup testing model"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    os.chdir('unit_tests')
+    test_network = HeatExchangerNetwork(test_case)
+    test_energy_balance = EnergyBalance(test_case, test_network.exchanger_addresses.matrix)
+    return test_energy_balance, test_network, test_case
+
+
+def test_balance_utility_heat_loads():
+    test_energy_balance, test_network, test_case = setup_model()
+    for heat_loads in [np.array([[3500, 0], [0, 3800], [0, 100], [5800, 0], [1500, 3500], [0, 0], [0, 0]]),
+                       np.array([[7000, 0], [0, 3800], [5000, 100], [5800, 0], [1500, 3500], [0, 0], [0, 0]])]:
+        test_network.thermodynamic_parameter.heat_loads = heat_loads
+        test_network.clear_cache()
+        for exchanger in test_case.range_balance_utility_heat_exchangers:
+            for operating_case in test_case.range_operating_cases:
+                assert abs(test_energy_balance.balance_utility_heat_loads(heat_loads)[exchanger, operating_case] - test_network.balance_utility_heat_exchangers[exchanger].heat_loads[operating_case]) <= 10e-3
+        assert (test_energy_balance.violation_distances(heat_loads) > 0) == test_network.infeasibility_energy_balance[0]
+        assert abs(test_energy_balance.violation_distances(heat_loads)**2 - test_network.infeasibility_energy_balance[1]) <= 10e-3
+
+
+def test_repair():
+    test_energy_balance, _, _ = setup_model()
+    minimal_heat_loads = np.array([[10, 10], [10, 10], [10, 10], [10, 10], [10, 10], [0, 0], [0, 0]])
+    heat_loads = np.array([[[7000, 10], [10, 3800], [5000, 100], [5800, 10], [1500, 3500], [0, 0], [0, 0]],
+                           [[1000, 10], [10, 1000], [10, 100], [1000, 10], [1000, 1000], [0, 0], [0, 0]]], dtype=float)
+    feasible_heat_loads = heat_loads[1].copy()
+    assert test_energy_balance.violation_distances(feasible_heat_loads) == 0
+    test_energy_balance.repair(heat_loads, minimal_heat_loads)
+    assert all(test_energy_balance.violation_distances(heat_loads) == 0)
+    assert np.all(heat_loads >= minimal_heat_loads)
+    assert np.array_equal(heat_loads[1], feasible_heat_loads)
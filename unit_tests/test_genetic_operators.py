@@ -0,0 +1,90 @@
+import os
+import sys
+import platform
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from types import SimpleNamespace
+import numpy as np
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+import algorithm.genetic_algorithm
+from algorithm.genetic_algorithm import GeneticAlgorithm
+
+
+def setup_model(match_index):
+    """Setup the GA of JonesP3 with a mutation probability which adds, removes and resamples exchangers"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    algorithm_parameter.genetic_algorithm_probability_mutation = 0.3
+    algorithm_parameter.genetic_algorithm_match_index = match_index
+    return test_case, GeneticAlgorithm(test_case, algorithm_parameter)
+
+
+def test_tournament_selection(monkeypatch):
+    population = [SimpleNamespace(indicator=SimpleNamespace(wvalues=(value,))) for value in [1.0, 3.0, 3.0, 0.0]]
+    monkeypatch.setattr(algorithm.genetic_algorithm, 'rng', np.random.default_rng(1))
+    winners = GeneticAlgorithm.tournament_selection(population, 200, 3)
+    aspirants = np.random.default_rng(1).integers(0, len(population), size=(200, 3)).tolist()
+    indicators = [individual.indicator.wvalues[0] for individual in population]
+    for winner, drawn in zip(winners, aspirants):
+        best = max(indicators[aspirant] for aspirant in drawn)
+        assert winner is population[next(aspirant for aspirant in drawn if indicators[aspirant] == best)]
+    ties = [drawn for drawn in aspirants if 1 in drawn and 2 in drawn]
+    assert any(drawn.index(1) < drawn.index(2) for drawn in ties) and any(drawn.index(2) < drawn.index(1) for drawn in ties)
+
+
+def test_crossover():
+    genomes = np.zeros([4, 5, 8], dtype=np.int8)
+    genomes[1::2] = 1
+    GeneticAlgorithm.crossover(genomes, np.array([True, False]))
+    assert genomes[0, 0, 0] == 0 and genomes[0, -1, 0] == 1
+    assert np.array_equal(genomes[0] + genomes[1], np.ones([5, 8]))
+    assert np.all(genomes[2] == 0) and np.all(genomes[3] == 1)
+
+
+def check_mutation(match_index, monkeypatch):
+    """Seeded mutation of random genomes: returns the genomes before and after, the drawn masks and mutated flags"""
+    test_case, genetic_algorithm = setup_model(match_index)
+    genomes = np.stack([genetic_algorithm.initialize_individual().alleles for _ in range(30)])
+    before = genomes.copy()
+    monkeypatch.setattr(algorithm.genetic_algorithm, 'rng', np.random.default_rng(2))
+    mutated = genetic_algorithm.mutation(genomes)
+    mutations = np.random.default_rng(2).random(genomes.shape[:2] + (4,)) < genetic_algorithm.algorithm_parameter.genetic_algorithm_probability_mutation
+    flipped, existent = mutations[..., 0], before[..., 7] == 1
+    added, removed, kept = flipped & ~existent, flipped & existent, ~flipped & ~existent
+    resampled = (existent & ~flipped)[..., np.newaxis] & mutations[..., [3, 2, 1]]
+    assert np.any(added) and np.any(removed) and np.any(resampled)
+    assert np.all(genomes[removed][:, [0, 1, 2, 7]] == 0)
+    assert np.all(genomes[added][:, 7] == 1)
+    assert np.array_equal(genomes[kept], before[kept])
+    unchanged = (existent & ~flipped)[..., np.newaxis] & ~resampled
+    assert np.array_equal(genomes[..., 0:3][unchanged], before[..., 0:3][unchanged])
+    assert np.array_equal(genomes[..., 3:7], before[..., 3:7])
+    assert np.array_equal(mutated, np.any(flipped | np.any(resampled, axis=-1), axis=1))
+    return test_case, genetic_algorithm, genomes, added, resampled
+
+
+def test_mutation(monkeypatch):
+    test_case, genetic_algorithm, genomes, added, resampled = check_mutation(False, monkeypatch)
+    generator = np.random.default_rng(2)
+    generator.random(genomes.shape[:2] + (4,))
+    draws = generator.integers(0, [test_case.number_hot_streams, test_case.number_cold_streams, test_case.number_enthalpy_stages], size=genomes.shape[:2] + (3,))
+    assert np.array_equal(genomes[added][:, 0:3], draws[added])
+    assert np.array_equal(genomes[..., 0:3][resampled], draws[resampled])
+
+
+def test_mutation_match_index(monkeypatch):
+    test_case, genetic_algorithm, genomes, added, resampled = check_mutation(True, monkeypatch)
+    existent = genomes[..., 7] == 1
+    hot_streams, cold_streams, enthalpy_stages = genomes[..., 0][existent], genomes[..., 1][existent], genomes[..., 2][existent]
+    assert np.all(genetic_algorithm.match_feasibility.viable[hot_streams, cold_streams, enthalpy_stages])
+    assert np.all(genomes[added][:, 0] < test_case.number_hot_streams) and np.all(genomes[added][:, 1] < test_case.number_cold_streams)
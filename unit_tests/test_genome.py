@@ -0,0 +1,42 @@
+import os
+import sys
+import platform
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+import numpy as np
+
+from algorithm.genome import CanonicalForm, Genome
+from read_data.read_case_study_data import CaseStudy
+
+
+def test_from_matrix_is_independent():
+    matrix = np.array([[1, 0, 2, 0, 0, 0, 0, 1], [0, 0, 0, 0, 0, 0, 0, 0]])
+    genome = Genome.from_matrix(matrix, np.int8)
+    genome[0, 7] = 0
+    assert genome.alleles.dtype == np.int8
+    assert genome[0][7] == 0 and matrix[0][7] == 1
+    genome[0, 7] = 1
+    assert np.array(genome).dtype == int
+    assert np.array_equal(np.array(genome), matrix)
+
+
+def test_canonical_form():
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    canonical_form = CanonicalForm(CaseStudy('Zweifel.xlsx'))
+    os.chdir('unit_tests')
+    assert [group.tolist() for group in canonical_form.interchangeable_groups] == [[2, 3, 4, 5, 6]]
+    genomes = np.zeros([2, 7, 8], dtype=np.int8)
+    genomes[:, 0] = [0, 0, 2, 0, 0, 0, 0, 1]
+    genomes[0, 3] = [1, 0, 1, 0, 0, 0, 0, 1]
+    genomes[0, 5] = [1, 1, 0, 0, 0, 0, 0, 0]
+    genomes[1, 6] = [1, 0, 1, 0, 0, 0, 0, 1]
+    assert canonical_form.key(genomes[0]) == canonical_form.key(genomes[1])
+    canonical_form(genomes)
+    assert np.array_equal(genomes[0], genomes[1])
+    assert np.array_equal(genomes[0, 2], [1, 0, 1, 0, 0, 0, 0, 1]) and np.all(genomes[0, 3:] == 0)
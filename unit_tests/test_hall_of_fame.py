@@ -0,0 +1,98 @@
+import os
+import sys
+import platform
+import numpy as np
+from deap import base
+from deap import creator
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from algorithm.genetic_algorithm import GeneticAlgorithm
+from algorithm.hall_of_fame import HallOfFame, SpillingHallOfFame
+
+
+def setup_model(indicators):
+    """Setup GA individuals, each with a one member DE front whose topology is given by its indicator's integer part"""
+    if not hasattr(creator, 'ParetoIndividual_ga'):
+        creator.create('HyperVolumeIndicator_ga', base.Fitness, weights=(1.0,))
+        creator.create('ParetoIndividual_ga', list, indicator=creator.HyperVolumeIndicator_ga)
+    if not hasattr(creator, 'Individual_de'):
+        creator.create('FitnessMin_de', base.Fitness, weights=(1.0, 1.0))
+        creator.create('Individual_de', list, fitness=creator.FitnessMin_de)
+    population = list()
+    for indicator in indicators:
+        individual_de = creator.Individual_de([np.full([2, 3], indicator), None, np.full([2, 8], int(indicator))])
+        individual_de.fitness.values = (indicator, 1.0)
+        individual = creator.ParetoIndividual_ga([individual_de])
+        individual.indicator.values = indicator,
+        population.append(individual)
+    return population
+
+
+def test_update():
+    hall_of_fame = HallOfFame(3, lambda exchanger_addresses: exchanger_addresses.tobytes())
+    hall_of_fame.update(setup_model([1.0, 5.0, 3.0, 5.0, 2.0]))
+    assert [individual.indicator.values[0] for individual in hall_of_fame] == [2.0, 3.0, 5.0]
+    hall_of_fame.update(setup_model([4.0, 1.5, 5.5]))
+    assert hall_of_fame.keys == [4.0, 5.0, 5.5]
+    assert len(hall_of_fame.index) == len(hall_of_fame) == 3
+    assert hall_of_fame[-1][0][2][0, 0] == 5
+
+
+def test_ties():
+    hall_of_fame = HallOfFame(2, lambda exchanger_addresses: exchanger_addresses.tobytes())
+    population = setup_model([2.0, 2.0, 2.0])
+    for topology, individual in enumerate(population):
+        individual[0][2] = np.full([2, 8], 10 + topology)
+    hall_of_fame.update(population)
+    assert [individual[0][2][0, 0] for individual in hall_of_fame] == [10, 11]
+    hall_of_fame.update(setup_model([3.0]))
+    assert hall_of_fame.keys == [2.0, 3.0] and hall_of_fame[0][0][2][0, 0] == 11
+    assert len(hall_of_fame.index) == len(hall_of_fame.heap) == 2
+
+
+def test_spilling_hall_of_fame(tmp_path):
+    def rebuild(exchanger_addresses, heat_loads):
+        return [creator.Individual_de([member.tolist(), None, exchanger_addresses]) for member in heat_loads]
+    hall_of_fame = SpillingHallOfFame(2, lambda exchanger_addresses: exchanger_addresses.tobytes(), str(tmp_path / 'hall_of_fame.dat'), 3, 2, 3, 2, rebuild)
+    hall_of_fame.update(setup_model([1.0, 3.0, 2.0, 4.0]))
+    assert hall_of_fame.keys == [3.0, 4.0] and sorted(hall_of_fame.free_slots) == []
+    best = hall_of_fame[-1]
+    assert best.indicator.values == (4.0,) and best[0].fitness.values == (4.0, 1.0)
+    assert np.array_equal(best[0][0], np.full([2, 3], 4.0)) and best[0][2][0, 0] == 4
+    assert hall_of_fame[-1] is best
+
+
+def test_rebuild_after_creator_deletion(tmp_path):
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    algorithm_parameter.genetic_algorithm_hall_of_fame_size = 6
+    algorithm_parameter.genetic_algorithm_hall_of_fame_file = str(tmp_path / 'hall_of_fame.dat')
+    genetic_algorithm = GeneticAlgorithm(test_case, algorithm_parameter)
+    setup_model([])
+    genetic_algorithm.individual_class_de = creator.Individual_de
+    hall_of_fame = genetic_algorithm.create_hall_of_fame()
+    exchanger_addresses = np.zeros([test_case.number_heat_exchangers, 8], dtype=int)
+    heat_loads = np.zeros([1, test_case.number_heat_exchangers, test_case.number_operating_cases])
+    population = list()
+    for indicator in range(1, 7):
+        individual = creator.ParetoIndividual_ga(genetic_algorithm.rebuild_pareto_front(exchanger_addresses, heat_loads))
+        individual.indicator.values = float(indicator),
+        population.append(individual)
+    hall_of_fame.update(population)
+    assert len(hall_of_fame) == 6 > hall_of_fame.rebuilt_records.maxsize
+    del creator.FitnessMin_de
+    del creator.Individual_de
+    indicators = [individual.indicator.values[0] for individual in hall_of_fame]
+    assert indicators == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    assert all(isinstance(individual[0], genetic_algorithm.individual_class_de) for individual in hall_of_fame)
+    assert hall_of_fame[0][0].fitness.values == population[0][0].fitness.values
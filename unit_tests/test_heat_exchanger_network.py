@@ -536,3 +536,18 @@ def test_utility_connection_violation_distance():
         ]
     )
     assert test_network.utility_connections_violation_distance(test_eam) == 3
+
+
+def test_violation_distances_of_stacked_topologies():
+    test_network, test_case = setup_model()
+    rng = np.random.default_rng(1)
+    test_eams = np.zeros([50, test_case.number_heat_exchangers, 8], dtype=int)
+    test_eams[..., 0] = rng.integers(0, test_case.number_hot_streams, size=test_eams.shape[:2])
+    test_eams[..., 1] = rng.integers(0, test_case.number_cold_streams, size=test_eams.shape[:2])
+    test_eams[..., 2] = rng.integers(0, test_case.number_enthalpy_stages, size=test_eams.shape[:2])
+    test_eams[..., 7] = rng.integers(0, 2, size=test_eams.shape[:2])
+    split_distances = test_network.split_heat_exchanger_violation_distances(test_eams)
+    utility_distances = test_network.utility_connections_violation_distances(test_eams)
+    for topology, test_eam in enumerate(test_eams):
+        assert split_distances[topology] == test_network.split_heat_exchanger_violation_distance(test_eam)
+        assert utility_distances[topology] == test_network.utility_connections_violation_distance(test_eam)
@@ -0,0 +1,85 @@
+import os
+import sys
+import platform
+import numpy as np
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from heat_exchanger_network.exchanger_addresses import ExchangerAddresses
+from algorithm.energy_balance import EnergyBalance
+from algorithm.heat_load_bounds import HeatLoadBounds
+
+
+def setup_model():
+    """Setup the initial and random topologies of JonesP3"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    os.chdir('unit_tests')
+    generator = np.random.default_rng(3)
+    topologies = [ExchangerAddresses(test_case).matrix]
+    for _ in range(5):
+        exchanger_addresses = np.zeros([test_case.number_heat_exchangers, 8], dtype=int)
+        exchanger_addresses[:, 0] = generator.integers(0, test_case.number_hot_streams, test_case.number_heat_exchangers)
+        exchanger_addresses[:, 1] = generator.integers(0, test_case.number_cold_streams, test_case.number_heat_exchangers)
+        exchanger_addresses[:, 2] = generator.integers(0, test_case.number_enthalpy_stages, test_case.number_heat_exchangers)
+        exchanger_addresses[:, 7] = generator.integers(0, 2, test_case.number_heat_exchangers)
+        topologies.append(exchanger_addresses)
+    return test_case, test_case.manual_parameter['MinimalHeatLoad'].iloc[0], topologies
+
+
+def test_bounds():
+    test_case, minimal_heat_load, topologies = setup_model()
+    for exchanger_addresses in topologies:
+        bounds = HeatLoadBounds(test_case, exchanger_addresses, minimal_heat_load)
+        for exchanger in test_case.range_heat_exchangers:
+            for operating_case in test_case.range_operating_cases:
+                max_heat_duty = 0.0
+                if exchanger_addresses[exchanger, 7] == 1:
+                    max_heat_duty = np.nanmin((test_case.hot_streams[exchanger_addresses[exchanger, 0]].enthalpy_flows[operating_case],
+                                               test_case.cold_streams[exchanger_addresses[exchanger, 1]].enthalpy_flows[operating_case]))
+                assert bounds.upper[exchanger, operating_case] == max_heat_duty
+                assert bounds.fixed_zero[exchanger, operating_case] == (max_heat_duty == 0)
+                assert bounds.lower[exchanger, operating_case] == (0.0 if max_heat_duty == 0 else minimal_heat_load)
+
+
+def test_tighten():
+    test_case, minimal_heat_load, topologies = setup_model()
+    for exchanger_addresses in topologies:
+        bounds = HeatLoadBounds(test_case, exchanger_addresses, minimal_heat_load)
+        tightened_bounds = HeatLoadBounds(test_case, exchanger_addresses, minimal_heat_load, tighten=True)
+        assert np.all(tightened_bounds.upper >= tightened_bounds.lower)
+        assert np.all(tightened_bounds.upper <= bounds.upper)
+        assert np.array_equal(tightened_bounds.lower, bounds.lower) and np.array_equal(tightened_bounds.fixed_zero, bounds.fixed_zero)
+        assert np.all(tightened_bounds.upper[tightened_bounds.fixed_zero] == 0)
+        assert np.allclose(tightened_bounds.span, tightened_bounds.upper - tightened_bounds.lower)
+
+
+def test_sample():
+    test_case, minimal_heat_load, topologies = setup_model()
+    for exchanger_addresses in topologies:
+        bounds = HeatLoadBounds(test_case, exchanger_addresses, minimal_heat_load, tighten=True)
+        energy_balance = EnergyBalance(test_case, exchanger_addresses)
+        for design in ['random', 'sobol', 'lhs']:
+            heat_loads = np.full([16, test_case.number_heat_exchangers, test_case.number_operating_cases], np.nan)
+            bounds.sample(heat_loads, design)
+            assert np.all(heat_loads[:, bounds.fixed_zero] == 0)
+            assert not np.any(bounds.violated(heat_loads))
+            energy_balance.repair(heat_loads, bounds.lower)
+            assert np.all(heat_loads[:, bounds.fixed_zero] == 0)
+            assert np.all(heat_loads[:, ~bounds.fixed_zero] >= minimal_heat_load)
+
+
+def test_violated():
+    test_case, minimal_heat_load, topologies = setup_model()
+    bounds = HeatLoadBounds(test_case, topologies[1], minimal_heat_load)
+    assert np.any(bounds.fixed_zero) and np.any(~bounds.fixed_zero)
+    heat_loads = np.stack([bounds.lower - 1.0, bounds.upper + 1.0, (bounds.lower + bounds.upper) / 2])
+    violated = bounds.violated(heat_loads)
+    assert np.array_equal(violated[0], ~bounds.fixed_zero) and np.array_equal(violated[1], ~bounds.fixed_zero)
+    assert not np.any(violated[2])
@@ -0,0 +1,67 @@
+import os
+import sys
+import platform
+import numpy as np
+import pytest
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from heat_exchanger_network.exchanger_addresses import ExchangerAddresses
+import algorithm.heat_load_bounds
+from algorithm.heat_load_bounds import HeatLoadBounds
+from algorithm.differential_evolution import DifferentialEvolution
+from algorithm.inner_optimizer import InnerOptimizer, MultiStartLocalSolver, create_inner_optimizer
+
+
+def setup_model():
+    """Setup the differential evolution of Zweifel (evaluator of the inner optimizers) with repaired heat loads"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('Zweifel.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    algorithm_parameter.differential_evolution_repair_energy_balance = True
+    return test_case, algorithm_parameter, DifferentialEvolution(test_case, algorithm_parameter)
+
+
+def test_create_inner_optimizer():
+    _, algorithm_parameter, differential_evolution = setup_model()
+    algorithm_parameter.inner_optimizer = 'DE'
+    assert create_inner_optimizer(differential_evolution, algorithm_parameter) is differential_evolution
+    algorithm_parameter.inner_optimizer = 'multistart'
+    algorithm_parameter.multi_start_number_starts = 3
+    algorithm_parameter.multi_start_number_evaluations = 20
+    multi_start = create_inner_optimizer(differential_evolution, algorithm_parameter)
+    assert isinstance(multi_start, MultiStartLocalSolver) and multi_start.number_starts == 3 and multi_start.maximal_evaluations == 20
+    assert multi_start.final_states is not differential_evolution.final_states
+    algorithm_parameter.inner_optimizer = 'simplex'
+    with pytest.raises(ValueError, match='Inner optimizer'):
+        create_inner_optimizer(differential_evolution, algorithm_parameter)
+    with pytest.raises(TypeError):
+        InnerOptimizer()
+
+
+def test_multi_start(monkeypatch):
+    test_case, _, differential_evolution = setup_model()
+    monkeypatch.setattr(algorithm.heat_load_bounds, 'rng', np.random.default_rng(5))
+    multi_start = MultiStartLocalSolver(differential_evolution, number_starts=4, maximal_evaluations=30)
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    heat_loads, objectives = multi_start.optimize(exchanger_addresses)
+    assert 0 < multi_start.number_evaluations <= 4 * 30
+    assert len(heat_loads) == len(objectives) > 0
+    bounds = HeatLoadBounds(test_case, exchanger_addresses, differential_evolution.min_heat_load)
+    assert not np.any(bounds.violated(heat_loads))
+    for member_heat_loads, member_objectives in zip(heat_loads, objectives):
+        evaluated_objectives = np.zeros(len(member_objectives))
+        assert differential_evolution.evaluate_heat_loads(exchanger_addresses, member_heat_loads, evaluated_objectives)
+        assert np.allclose(evaluated_objectives, member_objectives)
+    # Pareto front: no member dominates another one
+    assert not np.any(np.all(objectives[:, np.newaxis] >= objectives[np.newaxis], axis=2) & np.any(objectives[:, np.newaxis] > objectives[np.newaxis], axis=2))
+    multi_start.optimize_batch([exchanger_addresses, exchanger_addresses])
+    assert multi_start.final_states == [None, None]
@@ -0,0 +1,80 @@
+import os
+import sys
+import platform
+import numpy as np
+from deap import base
+from deap import creator
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from heat_exchanger_network.exchanger_addresses import ExchangerAddresses
+import algorithm.differential_evolution
+from algorithm.heat_load_bounds import HeatLoadBounds
+from algorithm.local_polishing import LocalPolishing
+from algorithm.genetic_algorithm import GeneticAlgorithm
+
+
+def setup_model(monkeypatch):
+    """Setup the GA of Zweifel with polishing of the elite and the DE pareto front of the initial topology"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('Zweifel.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    algorithm_parameter.number_workers = 1
+    algorithm_parameter.differential_evolution_polishing = 'L-BFGS-B'
+    algorithm_parameter.differential_evolution_polishing_evaluations = 40
+    if not hasattr(creator, 'ParetoIndividual_ga'):
+        creator.create('HyperVolumeIndicator_ga', base.Fitness, weights=(1.0,))
+        creator.create('ParetoIndividual_ga', list, indicator=creator.HyperVolumeIndicator_ga)
+    if not hasattr(creator, 'Individual_de'):
+        creator.create('FitnessMin_de', base.Fitness, weights=(1.0, 1.0))
+        creator.create('Individual_de', list, fitness=creator.FitnessMin_de)
+    genetic_algorithm = GeneticAlgorithm(test_case, algorithm_parameter)
+    exchanger_addresses = np.array(ExchangerAddresses(test_case).matrix, dtype=int)
+    monkeypatch.setattr(algorithm.differential_evolution, 'rng', np.random.default_rng(6))
+    heat_loads, objectives = genetic_algorithm.differential_evolution.optimize(exchanger_addresses)
+    assert len(heat_loads) > 0
+    bounds = HeatLoadBounds(test_case, exchanger_addresses, genetic_algorithm.differential_evolution.min_heat_load)
+    return genetic_algorithm, exchanger_addresses, heat_loads, objectives, bounds
+
+
+def test_polish(monkeypatch):
+    genetic_algorithm, exchanger_addresses, heat_loads, objectives, bounds = setup_model(monkeypatch)
+    for method in ['L-BFGS-B', 'SLSQP']:
+        local_polishing = LocalPolishing(genetic_algorithm.differential_evolution, method, 40)
+        number_polished = 0
+        for member_heat_loads, member_objectives in zip(heat_loads, objectives):
+            result = local_polishing.polish(exchanger_addresses, member_heat_loads, member_objectives)
+            if result is None:
+                continue
+            number_polished += 1
+            assert not np.any(bounds.violated(result[0]))
+            assert local_polishing.dominates(result[1], member_objectives)
+            evaluated_objectives = np.zeros(len(member_objectives))
+            assert genetic_algorithm.differential_evolution.evaluate_heat_loads(exchanger_addresses, result[0], evaluated_objectives)
+            assert np.allclose(evaluated_objectives, result[1])
+        assert number_polished > 0
+
+
+def test_polish_elite(monkeypatch):
+    genetic_algorithm, exchanger_addresses, heat_loads, objectives, bounds = setup_model(monkeypatch)
+    individual_ga = creator.ParetoIndividual_ga(genetic_algorithm.create_pareto_front(exchanger_addresses, heat_loads))
+    for ind_de in individual_ga:
+        ind_de.append(ind_de[1].exchanger_addresses.matrix)
+    front_objectives = [ind_de.fitness.values for ind_de in individual_ga]
+    genetic_algorithm.evaluate_hypervolume([individual_ga])
+    genetic_algorithm.polish_elite([individual_ga])
+    assert individual_ga.polished and individual_ga.indicator.valid
+    for ind_de in individual_ga:
+        assert ind_de[1].is_feasible and not np.any(bounds.violated(np.array(ind_de[0])))
+    # Each member of the front before polishing is kept or weakly dominated by a polished member
+    polished_objectives = np.array([ind_de.fitness.values for ind_de in individual_ga])
+    for member_objectives in front_objectives:
+        assert np.any(np.all(polished_objectives >= member_objectives, axis=1))
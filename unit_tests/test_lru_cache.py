@@ -0,0 +1,34 @@
+import os
+import sys
+import platform
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from algorithm.lru_cache import LRUCache
+
+
+def test_eviction():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.get('b', 0) == 0
+    assert len(cache) == 2
+
+
+def test_memory_cap():
+    cache = LRUCache(10, maxbytes=5, sizeof=len)
+    cache.put('a', 'xx')
+    cache.put('b', 'yyy')
+    cache.put('c', 'z')
+    assert 'a' not in cache and 'b' in cache and 'c' in cache
+    assert cache.number_bytes == 4
+    cache.get('a')
+    assert cache.statistics() == {'hits': 0, 'misses': 1, 'evictions': 1, 'entries': 2}
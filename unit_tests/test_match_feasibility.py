@@ -0,0 +1,41 @@
+import os
+import sys
+import platform
+import numpy as np
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from algorithm.match_feasibility import MatchFeasibilityIndex
+
+
+def setup_model():
+    """Setup testing model"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    os.chdir('unit_tests')
+    return MatchFeasibilityIndex(test_case), test_case
+
+
+def test_viable_matches():
+    test_index, test_case = setup_model()
+    assert not test_index.viable_pairs[test_case.hot_utilities_indices[0], test_case.cold_utilities_indices[0]]
+    assert np.sum(~test_index.viable_pairs) == 1
+    matches = test_index.sample_matches((100, 7))
+    assert np.all(test_index.viable[matches[..., 0], matches[..., 1], matches[..., 2]])
+
+
+def test_resample():
+    test_index, test_case = setup_model()
+    matches = np.zeros([500, 3], dtype=int)
+    matches[:, 0] = test_case.hot_utilities_indices[0]
+    resampled = np.zeros([500, 3], dtype=bool)
+    resampled[:, 1] = True
+    matches = test_index.resample(matches, np.zeros(500, dtype=bool), resampled)
+    assert np.all(test_index.viable_pairs[matches[:, 0], matches[:, 1]])
+    assert np.all(matches[:, 0] == test_case.hot_utilities_indices[0]) and np.all(matches[:, 2] == 0)
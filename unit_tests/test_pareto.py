@@ -0,0 +1,76 @@
+import os
+import sys
+import platform
+import numpy as np
+from deap import base
+from deap import creator
+from deap import tools
+from deap.tools._hypervolume import hv
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from algorithm.pareto import non_dominated_ranks, crowding_distances, pareto_front, select_nsga2, hypervolume_2d, hypervolumes_2d
+
+rng = np.random.default_rng(42)
+
+
+def setup_model(number_points=60):
+    """Setup random objectives (rounded to provoke duplicates) and the corresponding DEAP individuals"""
+    if not hasattr(creator, 'FitnessTest'):
+        creator.create('FitnessTest', base.Fitness, weights=(-1.0, -1.0))
+        creator.create('IndividualTest', list, fitness=creator.FitnessTest)
+    test_objectives = np.round(rng.random([number_points, 2]), 1)
+    test_individuals = list()
+    for index, objectives in enumerate(test_objectives):
+        individual = creator.IndividualTest([index])
+        individual.fitness.values = tuple(objectives)
+        test_individuals.append(individual)
+    return test_objectives, test_individuals
+
+
+def test_non_dominated_ranks():
+    for _ in range(20):
+        test_objectives, test_individuals = setup_model()
+        ranks = non_dominated_ranks(test_objectives)
+        for rank, front in enumerate(tools.sortNondominated(test_individuals, len(test_individuals))):
+            assert sorted(individual[0] for individual in front) == sorted(np.flatnonzero(ranks == rank))
+        assert sorted(pareto_front(test_objectives)) == sorted(individual[0] for individual in tools.sortLogNondominated(test_individuals, 1, first_front_only=True))
+
+
+def test_crowding_distances():
+    test_objectives, test_individuals = setup_model()
+    front = tools.sortNondominated(test_individuals, len(test_individuals))[1]
+    tools.emo.assignCrowdingDist(front)
+    distances = crowding_distances(test_objectives[[individual[0] for individual in front]])
+    for individual, distance in zip(front, distances):
+        assert individual.fitness.crowding_dist == distance or abs(individual.fitness.crowding_dist - distance) <= 10e-9
+
+
+def test_select_nsga2():
+    for k in [1, 10, 25, 60, 80]:
+        test_objectives, _ = setup_model()
+        selected = select_nsga2(test_objectives, k)
+        assert len(selected) == min(k, len(test_objectives))
+        assert len(np.unique(selected)) == len(selected)
+        ranks = non_dominated_ranks(test_objectives)
+        not_selected = np.setdiff1d(np.arange(len(test_objectives)), selected)
+        if len(not_selected) > 0:
+            assert np.max(ranks[selected]) <= np.min(ranks[not_selected])
+
+
+def test_hypervolume_2d():
+    reference_point = np.array([1.0, 0.9])
+    test_fronts = [setup_model(int(rng.integers(1, 30)))[0] for _ in range(20)]
+    for test_objectives in test_fronts:
+        relevant_objectives = test_objectives[np.all(test_objectives < reference_point, axis=1)]
+        expected = hv.hypervolume(relevant_objectives, reference_point) if len(relevant_objectives) > 0 else 0.0
+        assert abs(hypervolume_2d(test_objectives, reference_point) - expected) <= 10e-12
+    test_objectives = np.concatenate(test_fronts)
+    fronts = np.repeat(np.arange(len(test_fronts)), [len(front) for front in test_fronts])
+    order = rng.permutation(len(test_objectives))
+    hypervolumes = hypervolumes_2d(test_objectives[order], fronts[order], reference_point)
+    assert np.allclose(hypervolumes, [hypervolume_2d(front, reference_point) for front in test_fronts], rtol=0, atol=10e-12)
@@ -0,0 +1,84 @@
+import os
+import sys
+import platform
+from types import SimpleNamespace
+import numpy as np
+from deap import base
+from deap import creator
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from algorithm.genetic_algorithm import GeneticAlgorithm
+
+
+def setup_model(reference_point):
+    """Setup the GA of JonesP3 with a reference point mode"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    algorithm_parameter.genetic_algorithm_reference_point = reference_point
+    if not hasattr(creator, 'ParetoIndividual_ga'):
+        creator.create('HyperVolumeIndicator_ga', base.Fitness, weights=(1.0,))
+        creator.create('ParetoIndividual_ga', list, indicator=creator.HyperVolumeIndicator_ga)
+    if not hasattr(creator, 'Individual_de'):
+        creator.create('FitnessMin_de', base.Fitness, weights=(1.0, 1.0))
+        creator.create('Individual_de', list, fitness=creator.FitnessMin_de)
+    return GeneticAlgorithm(test_case, algorithm_parameter)
+
+
+def stub_population(fronts):
+    """GA individuals with feasible stub DE pareto fronts of the given objectives (reversed costs are their inverses)"""
+    population = list()
+    for front in fronts:
+        pareto_front_de = list()
+        for objectives in front:
+            ind_de = creator.Individual_de([np.ones([2, 2]), SimpleNamespace(is_feasible=True), np.zeros([2, 8], dtype=int)])
+            ind_de.fitness.values = objectives
+            pareto_front_de.append(ind_de)
+        population.append(creator.ParetoIndividual_ga(pareto_front_de))
+    return population
+
+
+def test_fixed():
+    genetic_algorithm = setup_model('fixed')
+    genetic_algorithm.evaluate_hypervolume(stub_population([[(1.0, 0.5)], [(0.5, 1.0)]]))
+    reference_point = genetic_algorithm.reference_point.copy()
+    assert np.allclose(reference_point, genetic_algorithm.algorithm_parameter.genetic_algorithm_reference_factor * np.array([2.0, 2.0]))
+    genetic_algorithm.evaluate_hypervolume(stub_population([[(0.25, 0.25)], [(4.0, 4.0)]]))
+    assert np.array_equal(genetic_algorithm.reference_point, reference_point)
+
+
+def test_monotonic():
+    genetic_algorithm = setup_model('monotonic')
+    genetic_algorithm.evaluate_hypervolume(stub_population([[(1.0, 0.5)]]))
+    reference_point = genetic_algorithm.reference_point.copy()
+    genetic_algorithm.evaluate_hypervolume(stub_population([[(4.0, 4.0)]]))
+    assert np.array_equal(genetic_algorithm.reference_point, reference_point)
+    genetic_algorithm.evaluate_hypervolume(stub_population([[(0.25, 1.0)]]))
+    assert np.all(genetic_algorithm.reference_point >= reference_point) and genetic_algorithm.reference_point[0] > reference_point[0]
+    assert genetic_algorithm.reference_point[1] == reference_point[1]
+
+
+def test_cached_indicators():
+    genetic_algorithm = setup_model('monotonic')
+    population = stub_population([[(1.0, 0.5), (0.5, 1.0)], [(0.5, 0.5)], [(0.8, 0.8)]])
+    genetic_algorithm.evaluate_hypervolume(population)
+    indicators = [individual.indicator.values[0] for individual in population]
+    assert all(indicator > 0 for indicator in indicators)
+    # Unchanged reference point: only the invalid indicator is evaluated
+    population[0].indicator.values = -1.0,
+    del population[1].indicator.values
+    genetic_algorithm.evaluate_hypervolume(population)
+    assert population[0].indicator.values[0] == -1.0 and population[1].indicator.values[0] == indicators[1]
+    # Grown reference point: all indicators are evaluated
+    population.extend(stub_population([[(0.1, 0.8)]]))
+    genetic_algorithm.evaluate_hypervolume(population)
+    assert all(individual.indicator.values[0] > indicator for individual, indicator in zip(population, indicators))
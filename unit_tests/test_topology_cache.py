@@ -0,0 +1,74 @@
+import os
+import sys
+import platform
+import numpy as np
+from deap import base
+from deap import creator
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from heat_exchanger_network.exchanger_addresses import ExchangerAddresses
+from heat_exchanger_network.heat_exchanger.operation_parameter import OperationParameter
+import algorithm.differential_evolution
+from algorithm.genome import Genome
+from algorithm.genetic_algorithm import GeneticAlgorithm
+
+
+def setup_model():
+    """Setup the GA of Zweifel with a topology cache (CacheGA) and a serial evaluation"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('Zweifel.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    algorithm_parameter.genetic_algorithm_cache_size = 10
+    algorithm_parameter.number_workers = 1
+    if not hasattr(creator, 'Individual_de'):
+        creator.create('FitnessMin_de', base.Fitness, weights=(1.0, 1.0))
+        creator.create('Individual_de', list, fitness=creator.FitnessMin_de)
+    genetic_algorithm = GeneticAlgorithm(test_case, algorithm_parameter)
+    genetic_algorithm.pseudo_pareto_front_de = genetic_algorithm.initialize_pseudo_pareto_front_de(base.Toolbox())
+    return test_case, genetic_algorithm
+
+
+def check_independent_fronts(pareto_front_de, other_pareto_front_de):
+    """Equal DE pareto fronts which share neither their members nor the networks of their members"""
+    assert pareto_front_de is not other_pareto_front_de and len(pareto_front_de) == len(other_pareto_front_de) > 0
+    for ind_de, other_ind_de in zip(pareto_front_de, other_pareto_front_de):
+        assert ind_de is not other_ind_de and ind_de[1] is not other_ind_de[1]
+        assert np.array_equal(ind_de[0], other_ind_de[0])
+        assert ind_de.fitness.values == other_ind_de.fitness.values
+        assert ind_de[1].is_feasible
+
+
+def test_duplicates_and_cached_topologies(monkeypatch):
+    test_case, genetic_algorithm = setup_model()
+    # Mixers of streams of equal heat capacity flows are chosen at random in each network calculation
+    monkeypatch.setattr(OperationParameter, 'random_choice', lambda self, array, seed=None: array[0])
+    monkeypatch.setattr(algorithm.differential_evolution, 'rng', np.random.default_rng(3))
+    optimized = list()
+    optimize = genetic_algorithm.inner_optimizer.optimize
+
+    def count_optimize(exchanger_addresses, *arguments, **keywords):
+        optimized.append(exchanger_addresses)
+        return optimize(exchanger_addresses, *arguments, **keywords)
+
+    monkeypatch.setattr(genetic_algorithm.inner_optimizer, 'optimize', count_optimize)
+    exchanger_addresses = ExchangerAddresses(test_case).matrix
+    individuals = [Genome.from_matrix(exchanger_addresses, genetic_algorithm.allele_type) for _ in range(2)]
+    # The duplicate topology of the same evaluation is optimized once
+    results = genetic_algorithm.evaluate_individuals(individuals)
+    assert len(optimized) == 1 and len(genetic_algorithm.topology_results) == 1
+    assert results[1][1] is None
+    check_independent_fronts(results[0][0], results[1][0])
+    # The cached topology of a later evaluation is not optimized again
+    results_cached = genetic_algorithm.evaluate_individuals([Genome.from_matrix(exchanger_addresses, genetic_algorithm.allele_type)])
+    assert len(optimized) == 1 and results_cached[0][1] is None
+    check_independent_fronts(results[0][0], results_cached[0][0])
+    check_independent_fronts(results[1][0], results_cached[0][0])
@@ -0,0 +1,31 @@
+import os
+import sys
+import platform
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+import numpy as np
+
+from algorithm.topology_store import TopologyStore
+from read_data.read_case_study_data import CaseStudy
+
+
+def test_store_and_eviction(tmp_path):
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('JonesP3.xlsx')
+    os.chdir('unit_tests')
+    store = TopologyStore(str(tmp_path / 'store.db'), test_case, ['TAC', 'GHG'], maxsize=2)
+    heat_loads = np.ones([3, test_case.number_heat_exchangers, test_case.number_operating_cases])
+    store.put(b'a', heat_loads, np.ones([3, 2]))
+    store.put(b'b', heat_loads[:1], np.ones([1, 2]))
+    assert store.get(b'a')[0].shape == heat_loads.shape
+    store.put(b'c', heat_loads[:0], np.ones([0, 2]))
+    assert store.get(b'b') is None and len(store) == 2
+    assert len(store.get(b'c')[0]) == 0
+    other_store = TopologyStore(str(tmp_path / 'store.db'), test_case, ['TAC', 'CAP'])
+    assert other_store.get(b'a') is None
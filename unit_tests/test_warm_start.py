@@ -0,0 +1,100 @@
+import os
+import sys
+import platform
+import numpy as np
+
+operating_system = platform.system()
+if operating_system == 'Windows':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'\\src')
+elif operating_system == 'Linux':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))+'/src')
+
+from read_data.read_case_study_data import CaseStudy
+from read_data.read_algorithm_parameter import AlgorithmParameter
+from heat_exchanger_network.exchanger_addresses import ExchangerAddresses
+from algorithm.genome import Genome
+from algorithm.heat_load_bounds import HeatLoadBounds
+from algorithm.differential_evolution import DifferentialEvolution
+from algorithm.genetic_algorithm import GeneticAlgorithm
+
+
+def setup_model():
+    """Setup the GA of Zweifel with warm started DE populations and a parent topology with two added matches"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir('..')
+    test_case = CaseStudy('Zweifel.xlsx')
+    algorithm_parameter = AlgorithmParameter('AlgorithmParameter_short_comp.xlsx')
+    os.chdir('unit_tests')
+    algorithm_parameter.differential_evolution_warm_start_fraction = 0.5
+    genetic_algorithm = GeneticAlgorithm(test_case, algorithm_parameter)
+    parent_addresses = np.array(ExchangerAddresses(test_case).matrix, dtype=int)
+    assert np.all(parent_addresses[2:, 7] == 0)
+    parent_addresses[2, [0, 1, 2, 7]] = [1, 1, 1, 1]
+    parent_addresses[3, [0, 1, 2, 7]] = [1, 2, 0, 1]
+    genetic_algorithm.canonical_form(parent_addresses)
+    parent_heat_loads = 100.0 + np.arange(2 * test_case.number_heat_exchangers * test_case.number_operating_cases, dtype=float).reshape(2, test_case.number_heat_exchangers, test_case.number_operating_cases)
+    return test_case, genetic_algorithm, parent_addresses, parent_heat_loads
+
+
+def test_canonical_warm_start():
+    test_case, genetic_algorithm, parent_addresses, parent_heat_loads = setup_model()
+    child = Genome.from_matrix(parent_addresses, genetic_algorithm.allele_type)
+    child[6, [0, 1, 2, 7]] = [0, 0, 0, 1]
+    genetic_algorithm.canonical_form(child.alleles)
+    # The added match sorts first in the group of interchangeable slots, the inherited ones move by one slot
+    assert np.array_equal(child[2:5, [0, 1, 2]], [[0, 0, 0], [1, 1, 1], [1, 2, 0]])
+    child.parent_fronts = [(parent_addresses, parent_heat_loads)]
+    initial_heat_loads = genetic_algorithm.warm_start_heat_loads(child)
+    assert len(initial_heat_loads) == round(0.5 * genetic_algorithm.algorithm_parameter.differential_evolution_population_size)
+    for seed, seed_heat_loads in enumerate(initial_heat_loads):
+        member = parent_heat_loads[seed % len(parent_heat_loads)]
+        assert np.array_equal(seed_heat_loads[[0, 1, 3, 4]], member[[0, 1, 2, 3]])
+        assert np.all(np.isnan(seed_heat_loads[[2, 5, 6]]))
+
+
+def test_inherited_exchangers():
+    _, _, parent_addresses, _ = setup_model()
+    child_addresses = parent_addresses.copy()
+    child_addresses[3, 2] = 2
+    child_addresses[4, [0, 1, 2, 7]] = [1, 1, 1, 1]
+    child_addresses[5, [0, 1, 2, 7]] = [1, 1, 1, 1]
+    parent_slots = GeneticAlgorithm.inherited_exchangers(parent_addresses, child_addresses)
+    # Slot 3 changed its stage, one of the two copies of the match of parent slot 2 is inherited (the same slot first)
+    assert parent_slots.tolist() == [0, 1, 2, -1, -1, -1, -1]
+    # Matches moved to another slot are inherited as well
+    child_addresses[[2, 4]] = child_addresses[[4, 2]]
+    child_addresses[2, 7] = 0
+    assert GeneticAlgorithm.inherited_exchangers(parent_addresses, child_addresses).tolist() == [0, 1, -1, -1, 2, -1, -1]
+
+
+def test_warm_start_parents():
+    test_case, genetic_algorithm, parent_addresses, parent_heat_loads = setup_model()
+    other_addresses = parent_addresses.copy()
+    other_addresses[0, 2] = (other_addresses[0, 2] + 1) % test_case.number_enthalpy_stages
+    other_heat_loads = -parent_heat_loads[:1]
+    child = Genome.from_matrix(parent_addresses, genetic_algorithm.allele_type)
+    child.parent_fronts = [(parent_addresses, parent_heat_loads), (other_addresses, other_heat_loads)]
+    initial_heat_loads = genetic_algorithm.warm_start_heat_loads(child)
+    # Even seeds prefer the first parent, odd seeds the second one, which did not have the match of slot 0
+    assert np.array_equal(initial_heat_loads[0, 0:4], parent_heat_loads[0, 0:4])
+    assert np.array_equal(initial_heat_loads[1, 0], parent_heat_loads[1, 0]) and np.array_equal(initial_heat_loads[1, 1:4], other_heat_loads[0, 1:4])
+    assert np.all(np.isnan(initial_heat_loads[:, 4:]))
+    child.parent_fronts = []
+    assert genetic_algorithm.warm_start_heat_loads(child) is None
+
+
+def test_seed_population():
+    test_case, genetic_algorithm, parent_addresses, _ = setup_model()
+    bounds = HeatLoadBounds(test_case, parent_addresses, genetic_algorithm.differential_evolution.min_heat_load)
+    heat_loads = np.zeros([6, test_case.number_heat_exchangers, test_case.number_operating_cases])
+    bounds.sample(heat_loads)
+    sampled = heat_loads.copy()
+    initial_heat_loads = np.full([4, test_case.number_heat_exchangers, test_case.number_operating_cases], np.nan)
+    initial_heat_loads[0] = bounds.upper + 1.0
+    initial_heat_loads[1] = bounds.lower - 1.0
+    initial_heat_loads[2, 0] = (bounds.lower[0] + bounds.upper[0]) / 2
+    DifferentialEvolution.seed_population(heat_loads, initial_heat_loads, bounds)
+    assert np.array_equal(heat_loads[0], bounds.upper) and np.array_equal(heat_loads[1], bounds.lower)
+    assert np.array_equal(heat_loads[2, 0], (bounds.lower[0] + bounds.upper[0]) / 2) and np.array_equal(heat_loads[2, 1:], sampled[2, 1:])
+    assert np.array_equal(heat_loads[3:], sampled[3:])
+    assert np.all(heat_loads[:, bounds.fixed_zero] == 0)